@@ -19,8 +19,13 @@ ecommerce_refactored.py
 from abc import ABC, abstractmethod
 from enum import Enum
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Union
 from decimal import Decimal
+from functools import lru_cache
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+import heapq
 import math
 
 
@@ -46,8 +51,13 @@ class DiscountConstants:
     BULK_DISCOUNT_THRESHOLD = 5
 
 
+# Сумма в центах или вес в граммах: int, если значение целое, иначе точный
+# Decimal. Целые идут быстрым путём, дробные не теряют точности
+Scaled = Union[int, Decimal]
+
+
 # ――― Value Objects (решение Primitive Obsession) ―――
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Money:
     """Value object для денежных сумм"""
     amount: Decimal
@@ -60,16 +70,51 @@ class Money:
     def __add__(self, other: 'Money') -> 'Money':
         if self.currency != other.currency:
             raise ValueError("Cannot add different currencies")
-        return Money(self.amount + other.amount, self.currency)
+        # Сумма двух неотрицательных значений неотрицательна, повторная проверка не нужна
+        return Money._unchecked(self.amount + other.amount, self.currency)
 
     def __mul__(self, multiplier: Decimal) -> 'Money':
         return Money(self.amount * multiplier, self.currency)
 
+    @classmethod
+    @lru_cache(maxsize=None)
+    def zero(cls, currency: str = "EUR") -> 'Money':
+        """Общий нулевой экземпляр: Money неизменяем, поэтому его можно разделять"""
+        return cls(Decimal('0'), currency)
+
+    @classmethod
+    def from_cents(cls, cents: Scaled, currency: str = "EUR") -> 'Money':
+        if cents < 0:
+            raise ValueError("Amount cannot be negative")
+        return cls._unchecked(Decimal(cents).scaleb(-2), currency)
+
+    @classmethod
+    def _unchecked(cls, amount: Decimal, currency: str = "EUR") -> 'Money':
+        """Создаёт Money без __post_init__ — только для заведомо неотрицательных сумм"""
+        money = object.__new__(cls)
+        object.__setattr__(money, 'amount', amount)
+        object.__setattr__(money, 'currency', currency)
+        return money
+
+    def to_cents(self) -> int:
+        cents = self.amount.scaleb(2)
+        if cents != cents.to_integral_value():
+            raise ValueError("Amount must be a whole number of cents")
+        return int(cents)
+
+    def scaled_cents(self) -> Scaled:
+        """Сумма в центах: int для целых центов, иначе точный Decimal"""
+        cents = self.amount.scaleb(2)
+        return int(cents) if cents == cents.to_integral_value() else cents
+
     def __str__(self) -> str:
         return f"€{self.amount:.2f}" if self.currency == "EUR" else f"{self.amount:.2f} {self.currency}"
 
 
-@dataclass(frozen=True)
+_ZERO_EUR = Money.zero()
+
+
+@dataclass(frozen=True, slots=True)
 class Weight:
     """Value object для веса"""
     kilograms: Decimal
@@ -81,6 +126,21 @@ class Weight:
     def __add__(self, other: 'Weight') -> 'Weight':
         return Weight(self.kilograms + other.kilograms)
 
+    @classmethod
+    def from_grams(cls, grams: Scaled) -> 'Weight':
+        return cls(Decimal(grams).scaleb(-3))
+
+    def to_grams(self) -> int:
+        grams = self.kilograms.scaleb(3)
+        if grams != grams.to_integral_value():
+            raise ValueError("Weight must be a whole number of grams")
+        return int(grams)
+
+    def scaled_grams(self) -> Scaled:
+        """Вес в граммах: int для целых граммов, иначе точный Decimal"""
+        grams = self.kilograms.scaleb(3)
+        return int(grams) if grams == grams.to_integral_value() else grams
+
     def is_light(self) -> bool:
         return self.kilograms < ShippingConstants.LIGHT_PACKAGE_THRESHOLD
 
@@ -97,53 +157,64 @@ class OrderStatus(Enum):
     CANCELLED = "CANCELLED"
 
     def display_name(self) -> str:
-        display_map = {
-            OrderStatus.OPEN: "📝 Open",
-            OrderStatus.PROCESSING: "⚙️ Processing",
-            OrderStatus.SHIPPED: "🚚 Shipped",
-            OrderStatus.DELIVERED: "✅ Delivered",
-            OrderStatus.CANCELLED: "❌ Cancelled"
-        }
-        return display_map.get(self, "❓ Unknown")
+        return _ORDER_STATUS_DISPLAY.get(self, "❓ Unknown")
 
     def can_be_cancelled(self) -> bool:
-        return self in [OrderStatus.OPEN, OrderStatus.PROCESSING]
+        return self in _CANCELLABLE_STATUSES
 
     def can_be_modified(self) -> bool:
         return self == OrderStatus.OPEN
 
 
+# Таблицы соответствий строятся один раз при импорте, а не на каждый вызов
+_ORDER_STATUS_DISPLAY = {
+    OrderStatus.OPEN: "📝 Open",
+    OrderStatus.PROCESSING: "⚙️ Processing",
+    OrderStatus.SHIPPED: "🚚 Shipped",
+    OrderStatus.DELIVERED: "✅ Delivered",
+    OrderStatus.CANCELLED: "❌ Cancelled"
+}
+
+_CANCELLABLE_STATUSES = frozenset({OrderStatus.OPEN, OrderStatus.PROCESSING})
+
+
 class CustomerType(Enum):
     REGULAR = "REGULAR"
     PREMIUM = "PREMIUM"
     GOLD = "GOLD"
 
     def display_prefix(self) -> str:
-        prefixes = {
-            CustomerType.REGULAR: "👤 ",
-            CustomerType.PREMIUM: "⭐ ",
-            CustomerType.GOLD: "🥇 "
-        }
-        return prefixes[self]
+        return _CUSTOMER_PREFIXES[self]
 
     def loyalty_multiplier(self) -> Decimal:
-        multipliers = {
-            CustomerType.REGULAR: Decimal('0.05'),
-            CustomerType.PREMIUM: Decimal('0.10'),
-            CustomerType.GOLD: Decimal('0.15')
-        }
-        return multipliers[self]
+        return _LOYALTY_MULTIPLIERS[self]
 
     def min_items_for_loyalty(self) -> int:
-        minimums = {
-            CustomerType.REGULAR: 3,
-            CustomerType.PREMIUM: 2,
-            CustomerType.GOLD: 1
-        }
-        return minimums[self]
+        return _LOYALTY_MIN_ITEMS[self]
 
     def has_free_shipping_privilege(self) -> bool:
-        return self in [CustomerType.PREMIUM, CustomerType.GOLD]
+        return self in _FREE_SHIPPING_TYPES
+
+
+_CUSTOMER_PREFIXES = {
+    CustomerType.REGULAR: "👤 ",
+    CustomerType.PREMIUM: "⭐ ",
+    CustomerType.GOLD: "🥇 "
+}
+
+_LOYALTY_MULTIPLIERS = {
+    CustomerType.REGULAR: Decimal('0.05'),
+    CustomerType.PREMIUM: Decimal('0.10'),
+    CustomerType.GOLD: Decimal('0.15')
+}
+
+_LOYALTY_MIN_ITEMS = {
+    CustomerType.REGULAR: 3,
+    CustomerType.PREMIUM: 2,
+    CustomerType.GOLD: 1
+}
+
+_FREE_SHIPPING_TYPES = frozenset({CustomerType.PREMIUM, CustomerType.GOLD})
 
 
 class ProductCategory(Enum):
@@ -154,38 +225,68 @@ class ProductCategory(Enum):
     LUXURY = "luxury"
 
 
+# Порядковые номера категорий для счётчиков в виде списков
+_CATEGORIES = tuple(ProductCategory)
+_CATEGORY_INDEX = {category: index for index, category in enumerate(_CATEGORIES)}
+
+
 class PaymentMethod(Enum):
     CREDIT = "CREDIT"
     DEBIT = "DEBIT"
     PAYPAL = "PAYPAL"
 
     def processing_fee_rate(self) -> Decimal:
-        rates = {
-            PaymentMethod.CREDIT: Decimal('0.029'),
-            PaymentMethod.DEBIT: Decimal('0.019'),
-            PaymentMethod.PAYPAL: Decimal('0.034')
-        }
-        return rates[self]
+        return _PROCESSING_FEE_RATES[self]
 
     def fixed_fee(self) -> Decimal:
-        fees = {
-            PaymentMethod.CREDIT: Decimal('0.00'),
-            PaymentMethod.DEBIT: Decimal('0.00'),
-            PaymentMethod.PAYPAL: Decimal('0.30')
-        }
-        return fees[self]
+        return _FIXED_FEES[self]
+
+
+_PROCESSING_FEE_RATES = {
+    PaymentMethod.CREDIT: Decimal('0.029'),
+    PaymentMethod.DEBIT: Decimal('0.019'),
+    PaymentMethod.PAYPAL: Decimal('0.034')
+}
+
+_FIXED_FEES = {
+    PaymentMethod.CREDIT: Decimal('0.00'),
+    PaymentMethod.DEBIT: Decimal('0.00'),
+    PaymentMethod.PAYPAL: Decimal('0.30')
+}
 
 
 # ――― Rich Domain Objects (вместо Data Classes) ―――
 class Product:
     """Rich domain object с поведением"""
 
+    __slots__ = ('name', '_price', '_cents', 'category', '_weight', '_grams')
+
     def __init__(self, name: str, price: Money, category: ProductCategory, weight: Weight):
         self.name = name
         self.price = price
         self.category = category
         self.weight = weight
 
+    # Центы/граммы кэшируются для горячих циклов агрегации; доли цента или
+    # грамма хранятся точным Decimal, а не отвергаются
+    @property
+    def price(self) -> Money:
+        return self._price
+
+    @price.setter
+    def price(self, value: Money) -> None:
+        self._price = value
+        self._cents = value.scaled_cents()
+
+    @property
+    def weight(self) -> Weight:
+        return self._weight
+
+    @weight.setter
+    def weight(self, value: Weight) -> None:
+        self._weight = value
+        self._grams = value.scaled_grams()
+
     def is_expensive(self) -> bool:
         return self.price.amount > Decimal('100')
 
@@ -196,7 +297,7 @@ class Product:
         return self.price * tax_rate
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderItem:
     """Represents a product with quantity in an order"""
     product: Product
@@ -207,13 +308,23 @@ class OrderItem:
             raise ValueError("Quantity must be positive")
 
     def total_price(self) -> Money:
-        return self.product.price * Decimal(str(self.quantity))
+        return Money.from_cents(self.total_cents(), self.product.price.currency)
 
     def total_weight(self) -> Weight:
-        return Weight(self.product.weight.kilograms * Decimal(str(self.quantity)))
+        return Weight.from_grams(self.total_grams())
+
+    # Целые, если цена и вес кратны центу и грамму, иначе точный Decimal
+    def total_cents(self) -> Scaled:
+        return self.product._cents * self.quantity
+
+    def total_grams(self) -> Scaled:
+        return self.product._grams * self.quantity
 
 
 # ――― Validation Services (извлечено из Large Class) ―――
+_PHONE_SEPARATORS = str.maketrans("", "", "-() ")
+
+
 class CustomerValidator:
     """Отвечает только за валидацию данных клиента"""
 
@@ -223,7 +334,7 @@ class CustomerValidator:
 
     @staticmethod
     def is_valid_phone(phone: str) -> bool:
-        cleaned = phone.replace("-", "").replace(" ", "").replace("(", "").replace(")", "")
+        cleaned = phone.translate(_PHONE_SEPARATORS)
         return len(cleaned) >= 10 and cleaned.isdigit()
 
 
@@ -239,6 +350,9 @@ class CustomerFormatter:
 class Customer:
     """Сфокусированный класс клиента без множественных ответственностей"""
 
+    __slots__ = ('customer_id', 'name', 'email', 'customer_type', 'total_spent',
+                 'orders_count', 'address', 'phone')
+
     def __init__(self, customer_id: int, name: str, email: str, customer_type: CustomerType,
                  total_spent: Money, orders_count: int):
         self.customer_id = customer_id
@@ -277,27 +391,33 @@ class OrderCalculator:
     @staticmethod
     def calculate_total_price(items: List[OrderItem]) -> Money:
         if not items:
-            return Money(Decimal('0'))
+            return _ZERO_EUR
 
-        total = items[0].total_price()
-        for item in items[1:]:
-            total += item.total_price()
-        return total
+        currency = items[0].product.price.currency
+        return Money.from_cents(OrderCalculator.calculate_total_cents(items, currency), currency)
+
+    @staticmethod
+    def calculate_total_cents(items: List[OrderItem], currency: str = "EUR") -> Scaled:
+        total_cents = 0
+        for item in items:
+            if item.product.price.currency != currency:
+                raise ValueError("Cannot add different currencies")
+            total_cents += item.product._cents * item.quantity
+        return total_cents
 
     @staticmethod
     def calculate_total_weight(items: List[OrderItem]) -> Weight:
-        total_kg = Decimal('0')
+        total_grams = 0
         for item in items:
-            total_kg += item.total_weight().kilograms
-        return Weight(total_kg)
+            total_grams += item.product._grams * item.quantity
+        return Weight.from_grams(total_grams)
 
     @staticmethod
     def count_items_by_category(items: List[OrderItem]) -> Dict[ProductCategory, int]:
-        counts = {}
+        counts = [0] * len(_CATEGORIES)
         for item in items:
-            category = item.product.category
-            counts[category] = counts.get(category, 0) + item.quantity
-        return counts
+            counts[_CATEGORY_INDEX[item.product.category]] += item.quantity
+        return {category: count for category, count in zip(_CATEGORIES, counts) if count}
 
 
 # ――― Strategy Pattern для скидок ―――
@@ -321,7 +441,7 @@ class LoyaltyDiscountStrategy(DiscountStrategy):
             discount_rate = customer.customer_type.loyalty_multiplier()
             return order_total * discount_rate
 
-        return Money(Decimal('0'))
+        return _ZERO_EUR
 
 
 class BulkDiscountStrategy(DiscountStrategy):
@@ -334,7 +454,7 @@ class BulkDiscountStrategy(DiscountStrategy):
         total_discount = Decimal('0')
         for category, count in category_counts.items():
             if count >= DiscountConstants.BULK_DISCOUNT_THRESHOLD:
-                total_discount += Decimal(str(count)) * DiscountConstants.BULK_DISCOUNT_PER_ITEM
+                total_discount += Decimal(count) * DiscountConstants.BULK_DISCOUNT_PER_ITEM
 
         return Money(total_discount)
 
@@ -342,21 +462,23 @@ class BulkDiscountStrategy(DiscountStrategy):
 class DiscountCalculator:
     """Использует стратегии для расчёта скидок"""
 
-    def __init__(self):
-        self.strategies = [
-            LoyaltyDiscountStrategy(),
-            BulkDiscountStrategy()
-        ]
+    # Стратегии не хранят состояния, поэтому общие для всех экземпляров
+    strategies = [
+        LoyaltyDiscountStrategy(),
+        BulkDiscountStrategy()
+    ]
 
     def calculate_total_discount(self, order_total: Money, items: List[OrderItem],
                                  customer: Customer) -> Money:
-        total_discount = Money(Decimal('0'))
+        total_amount = sum(
+            (strategy.calculate_discount(order_total, items, customer).amount
+             for strategy in self.strategies),
+            Decimal('0')
+        )
+        return Money._unchecked(total_amount)
 
-        for strategy in self.strategies:
-            discount = strategy.calculate_discount(order_total, items, customer)
-            total_discount += discount
 
-        return total_discount
+_DISCOUNT_CALCULATOR = DiscountCalculator()
 
 
 # ――― Strategy Pattern для доставки ―――
@@ -376,7 +498,7 @@ class StandardShippingStrategy(ShippingStrategy):
                            customer: Customer) -> Money:
         # Бесплатная доставка для крупных заказов
         if order_total.amount >= ShippingConstants.FREE_SHIPPING_THRESHOLD:
-            return Money(Decimal('0'))
+            return _ZERO_EUR
 
         # Расчёт по весу
         if total_weight.is_light():
@@ -390,12 +512,18 @@ class StandardShippingStrategy(ShippingStrategy):
 class PremiumShippingStrategy(ShippingStrategy):
     """Премиум стратегия доставки с льготами"""
 
+    _RATES_PER_KG = {
+        CustomerType.REGULAR: Decimal('2.50'),
+        CustomerType.PREMIUM: Decimal('2.00'),
+        CustomerType.GOLD: Decimal('1.50')
+    }
+
     def calculate_shipping(self, order_total: Money, total_weight: Weight,
                            customer: Customer) -> Money:
         # Бесплатная доставка для премиум клиентов при меньшей сумме
         if (customer.can_get_free_shipping() and
                 order_total.amount >= Decimal('50')):
-            return Money(Decimal('0'))
+            return _ZERO_EUR
 
         # Льготные тарифы по типу клиента
         rate_per_kg = self._get_rate_for_customer_type(customer.customer_type)
@@ -408,61 +536,64 @@ class PremiumShippingStrategy(ShippingStrategy):
         return Money(base_cost)
 
     def _get_rate_for_customer_type(self, customer_type: CustomerType) -> Decimal:
-        rates = {
-            CustomerType.REGULAR: Decimal('2.50'),
-            CustomerType.PREMIUM: Decimal('2.00'),
-            CustomerType.GOLD: Decimal('1.50')
-        }
-        return rates[customer_type]
+        return self._RATES_PER_KG[customer_type]
 
 
 class ShippingCalculator:
     """Использует стратегии для расчёта доставки"""
 
-    def __init__(self):
-        self.standard_strategy = StandardShippingStrategy()
-        self.premium_strategy = PremiumShippingStrategy()
+    standard_strategy = StandardShippingStrategy()
+    premium_strategy = PremiumShippingStrategy()
+    _PREMIUM_TYPES = frozenset({CustomerType.PREMIUM, CustomerType.GOLD})
 
     def calculate_shipping(self, order_total: Money, total_weight: Weight,
                            customer: Customer) -> Money:
-        if customer.customer_type in [CustomerType.PREMIUM, CustomerType.GOLD]:
+        if customer.customer_type in self._PREMIUM_TYPES:
             return self.premium_strategy.calculate_shipping(order_total, total_weight, customer)
         else:
             return self.standard_strategy.calculate_shipping(order_total, total_weight, customer)
 
 
+_SHIPPING_CALCULATOR = ShippingCalculator()
+
+
 # ――― Order (очищен от God Class проблем) ―――
 class Order:
     """Сфокусированный класс заказа"""
 
+    __slots__ = ('customer_id', 'items', 'status', 'shipping_address', 'notes')
+
     def __init__(self, customer_id: int):
         self.customer_id = customer_id
         self.items: List[OrderItem] = []
         self.status = OrderStatus.OPEN
         self.shipping_address = ""
         self.notes = ""
-        self._calculator = OrderCalculator()
-        self._discount_calculator = DiscountCalculator()
-        self._shipping_calculator = ShippingCalculator()
 
     def add_item(self, product: Product, quantity: int = 1) -> None:
         order_item = OrderItem(product, quantity)
         self.items.append(order_item)
 
     def total_price(self) -> Money:
-        return self._calculator.calculate_total_price(self.items)
+        return OrderCalculator.calculate_total_price(self.items)
 
     def total_weight(self) -> Weight:
-        return self._calculator.calculate_total_weight(self.items)
-
-    def calculate_discount(self, customer: Customer) -> Money:
-        order_total = self.total_price()
-        return self._discount_calculator.calculate_total_discount(order_total, self.items, customer)
-
-    def calculate_shipping(self, customer: Customer) -> Money:
-        order_total = self.total_price()
-        total_weight = self.total_weight()
-        return self._shipping_calculator.calculate_shipping(order_total, total_weight, customer)
+        return OrderCalculator.calculate_total_weight(self.items)
+
+    def calculate_discount(self, customer: Customer,
+                           order_total: Optional[Money] = None) -> Money:
+        if order_total is None:
+            order_total = self.total_price()
+        return _DISCOUNT_CALCULATOR.calculate_total_discount(order_total, self.items, customer)
+
+    def calculate_shipping(self, customer: Customer,
+                           order_total: Optional[Money] = None,
+                           total_weight: Optional[Weight] = None) -> Money:
+        if order_total is None:
+            order_total = self.total_price()
+        if total_weight is None:
+            total_weight = self.total_weight()
+        return _SHIPPING_CALCULATOR.calculate_shipping(order_total, total_weight, customer)
 
     def get_status_display(self) -> str:
         return self.status.display_name()
@@ -478,7 +609,7 @@ class Order:
 
 
 # ――― Payment Processing (исправлен Primitive Obsession) ―――
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CreditCard:
     """Value object для кредитной карты"""
     number: str
@@ -497,7 +628,7 @@ class CreditCard:
                 self.cvv.isdigit())
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PaymentRequest:
     """Parameter object вместо Long Parameter List"""
     amount: Money
@@ -523,7 +654,7 @@ class PaymentProcessor:
 
 
 # ――― Analytics (разбили Long Method) ―――
-@dataclass
+@dataclass(slots=True)
 class RevenueMetrics:
     """Data class для метрик выручки"""
     net_revenue: Money
@@ -533,7 +664,7 @@ class RevenueMetrics:
     discounts_given: Money
 
 
-@dataclass
+@dataclass(slots=True)
 class CustomerMetrics:
     """Data class для метрик клиентов"""
     segments: Dict[CustomerType, int]
@@ -541,123 +672,320 @@ class CustomerMetrics:
     avg_items_per_order: Decimal
 
 
-@dataclass
+@dataclass(slots=True)
 class CategoryMetrics:
     """Data class для метрик категорий"""
     stats: Dict[ProductCategory, Dict[str, any]]
 
 
-class RevenueAnalyzer:
-    """Отвечает только за анализ выручки"""
+# ――― Плоское представление позиций (SoA) для аналитики ―――
+@dataclass(slots=True)
+class ItemAggregates:
+    """Суммы по заказам и категориям в центах и граммах"""
+    order_cents: List[Scaled]
+    order_grams: List[Scaled]
+    order_quantities: List[int]
+    category_counts: List[int]
+    category_cents: List[Scaled]
+    category_order: List[int]
+
+    @classmethod
+    def merge(cls, partials: List['ItemAggregates']) -> 'ItemAggregates':
+        """Складывает частичные суммы, посчитанные по непересекающимся срезам позиций"""
+        first, *rest = partials
+        merged = cls(
+            order_cents=list(first.order_cents),
+            order_grams=list(first.order_grams),
+            order_quantities=list(first.order_quantities),
+            category_counts=list(first.category_counts),
+            category_cents=list(first.category_cents),
+            category_order=list(first.category_order)
+        )
+        for partial in rest:
+            merged.order_cents = [a + b for a, b in zip(merged.order_cents, partial.order_cents)]
+            merged.order_grams = [a + b for a, b in zip(merged.order_grams, partial.order_grams)]
+            merged.order_quantities = [a + b for a, b in
+                                       zip(merged.order_quantities, partial.order_quantities)]
+            merged.category_counts = [a + b for a, b in
+                                      zip(merged.category_counts, partial.category_counts)]
+            merged.category_cents = [a + b for a, b in
+                                     zip(merged.category_cents, partial.category_cents)]
+            # Срезы идут по порядку позиций, поэтому первое появление сохраняется
+            merged.category_order.extend(
+                category for category in partial.category_order
+                if category not in merged.category_order
+            )
+        return merged
+
+
+def _scaled_column(values: List[Scaled]) -> Union[array, List[Scaled]]:
+    """Целые значения упаковываются в array('q'), с долями центов или граммов остаётся список"""
+    try:
+        return array('q', values)
+    except TypeError:
+        return values
+
+
+@dataclass(frozen=True, slots=True)
+class ItemColumns:
+    """Позиции всех заказов в виде параллельных массивов"""
+    price_cents: Union[array, List[Scaled]]
+    grams: Union[array, List[Scaled]]
+    quantities: array
+    order_index: array
+    category_index: array
+    orders_count: int
+
+    @classmethod
+    def from_orders(cls, orders: List[Order]) -> 'ItemColumns':
+        price_cents, grams = [], []
+        quantities, order_index, category_index = array('q'), array('q'), array('q')
+
+        for index, order in enumerate(orders):
+            for item in order.items:
+                product = item.product
+                if product.price.currency != "EUR":
+                    raise ValueError("Cannot add different currencies")
+                price_cents.append(product._cents)
+                grams.append(product._grams)
+                quantities.append(item.quantity)
+                order_index.append(index)
+                category_index.append(_CATEGORY_INDEX[product.category])
+
+        return cls(_scaled_column(price_cents), _scaled_column(grams),
+                   quantities, order_index, category_index, len(orders))
+
+    def split(self, parts: int) -> List['ItemColumns']:
+        """Делит позиции на последовательные срезы; индексы заказов остаются глобальными"""
+        size = max(1, -(-len(self.quantities) // parts))
+        return [
+            ItemColumns(
+                self.price_cents[start:start + size],
+                self.grams[start:start + size],
+                self.quantities[start:start + size],
+                self.order_index[start:start + size],
+                self.category_index[start:start + size],
+                self.orders_count
+            )
+            for start in range(0, len(self.quantities), size)
+        ]
 
-    def analyze_revenue(self, orders: List[Order], customers: Dict[int, Customer]) -> RevenueMetrics:
-        net_total = Money(Decimal('0'))
-        gross_total = Money(Decimal('0'))
-        tax_total = Money(Decimal('0'))
-        shipping_total = Money(Decimal('0'))
-        discount_total = Money(Decimal('0'))
+    def aggregate(self) -> ItemAggregates:
+        """Один проход по центам и граммам без Money во внутреннем цикле"""
+        order_cents = [0] * self.orders_count
+        order_grams = [0] * self.orders_count
+        order_quantities = [0] * self.orders_count
+        category_counts = [0] * len(_CATEGORIES)
+        category_cents = [0] * len(_CATEGORIES)
+
+        for cents, grams, quantity, order, category in zip(
+                self.price_cents, self.grams, self.quantities,
+                self.order_index, self.category_index):
+            line_cents = cents * quantity
+            order_cents[order] += line_cents
+            order_grams[order] += grams * quantity
+            order_quantities[order] += quantity
+            category_counts[category] += quantity
+            category_cents[category] += line_cents
+
+        # Порядок первого появления восстанавливается после цикла,
+        # чтобы не проверять его на каждой позиции
+        category_order = sorted(
+            (category for category, count in enumerate(category_counts) if count),
+            key=self.category_index.index
+        )
 
-        for order in orders:
-            customer = customers.get(order.customer_id)
-            if not customer:
-                continue
+        return ItemAggregates(
+            order_cents=order_cents,
+            order_grams=order_grams,
+            order_quantities=order_quantities,
+            category_counts=category_counts,
+            category_cents=category_cents,
+            category_order=category_order
+        )
+
+
+def _aggregate_orders(orders: List[Order], workers: Optional[int] = None) -> ItemAggregates:
+    columns = ItemColumns.from_orders(orders)
+    chunks = columns.split(workers) if workers and workers > 1 else []
+    if len(chunks) < 2:
+        return columns.aggregate()
+
+    # Свёртка — чистая функция от срезов, поэтому её можно раздать по процессам без GIL
+    with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+        partials = list(executor.map(ItemColumns.aggregate, chunks))
+    return ItemAggregates.merge(partials)
+
+
+class _RevenueAccumulator:
+    """Накапливает выручку в центах и сырых Decimal, Money создаётся только в result()"""
 
-            net_price = order.total_price()
-            tax_amount = net_price * TaxRates.EUR
-            gross_price = net_price + tax_amount
-            shipping_cost = order.calculate_shipping(customer)
-            discount_amount = order.calculate_discount(customer)
+    __slots__ = ('net_cents', 'shipping_amount', 'discount_amount')
 
-            net_total += net_price
-            gross_total += gross_price
-            tax_total += tax_amount
-            shipping_total += shipping_cost
-            discount_total += discount_amount
+    def __init__(self):
+        self.net_cents = 0
+        self.shipping_amount = Decimal('0')
+        self.discount_amount = Decimal('0')
+
+    def add(self, order: Order, customer: Customer, order_cents: Scaled, order_grams: Scaled) -> None:
+        # Сумма заказа считается один раз и переиспользуется для доставки и скидок
+        order_total = Money.from_cents(order_cents)
+        total_weight = Weight.from_grams(order_grams)
+
+        self.net_cents += order_cents
+        self.shipping_amount += order.calculate_shipping(customer, order_total, total_weight).amount
+        self.discount_amount += order.calculate_discount(customer, order_total).amount
+
+    def result(self) -> RevenueMetrics:
+        # Налог линеен по сумме, поэтому считается один раз для итога
+        net_total = Money.from_cents(self.net_cents)
+        tax_total = net_total * TaxRates.EUR
 
         return RevenueMetrics(
             net_revenue=net_total,
-            gross_revenue=gross_total,
+            gross_revenue=net_total + tax_total,
             tax_amount=tax_total,
-            shipping_revenue=shipping_total,
-            discounts_given=discount_total
+            shipping_revenue=Money._unchecked(self.shipping_amount),
+            discounts_given=Money._unchecked(self.discount_amount)
         )
 
 
-class CustomerAnalyzer:
-    """Отвечает только за анализ клиентов"""
+class _CustomerAccumulator:
+    """Накапливает сегменты и выручку по клиентам"""
 
-    def analyze_customers(self, orders: List[Order], customers: Dict[int, Customer]) -> CustomerMetrics:
-        segments = {customer_type: 0 for customer_type in CustomerType}
-        top_customers = {}
-        total_items = 0
+    __slots__ = ('segments', 'top_customers', 'revenue_cents', 'total_items')
 
-        for order in orders:
-            customer = customers.get(order.customer_id)
-            if not customer:
-                continue
+    def __init__(self):
+        self.segments = {customer_type: 0 for customer_type in CustomerType}
+        self.top_customers = {}
+        self.revenue_cents = {}
+        self.total_items = 0
 
-            # Сегментация
-            segments[customer.customer_type] += 1
+    def add(self, order: Order, customer: Customer, order_cents: Scaled, order_quantity: int) -> None:
+        # Сегментация
+        self.segments[customer.customer_type] += 1
 
-            # Топ клиенты
-            if order.customer_id not in top_customers:
-                top_customers[order.customer_id] = {
-                    "revenue": Money(Decimal('0')),
-                    "orders": 0,
-                    "avg_order": Money(Decimal('0'))
-                }
+        # Топ клиенты
+        if order.customer_id not in self.top_customers:
+            self.top_customers[order.customer_id] = {
+                "revenue": _ZERO_EUR,
+                "orders": 0,
+                "avg_order": _ZERO_EUR
+            }
+            self.revenue_cents[order.customer_id] = 0
 
-            order_total = order.total_price()
-            top_customers[order.customer_id]["revenue"] += order_total
-            top_customers[order.customer_id]["orders"] += 1
+        self.revenue_cents[order.customer_id] += order_cents
+        self.top_customers[order.customer_id]["orders"] += 1
 
-            total_items += order.get_item_count()
+        self.total_items += order_quantity
 
+    def result(self, orders_count: int) -> CustomerMetrics:
         # Расчёт средних значений
-        for customer_stats in top_customers.values():
+        for customer_id, customer_stats in self.top_customers.items():
+            customer_stats["revenue"] = Money.from_cents(self.revenue_cents[customer_id])
             if customer_stats["orders"] > 0:
-                avg_amount = customer_stats["revenue"].amount / Decimal(str(customer_stats["orders"]))
-                customer_stats["avg_order"] = Money(avg_amount)
+                avg_amount = customer_stats["revenue"].amount / Decimal(customer_stats["orders"])
+                customer_stats["avg_order"] = Money._unchecked(avg_amount)
 
         avg_items = Decimal('0')
-        if orders:
-            avg_items = Decimal(str(total_items)) / Decimal(str(len(orders)))
+        if orders_count:
+            avg_items = Decimal(self.total_items) / Decimal(orders_count)
 
         return CustomerMetrics(
-            segments=segments,
-            top_customers=top_customers,
+            segments=self.segments,
+            top_customers=self.top_customers,
             avg_items_per_order=avg_items
         )
 
 
+class RevenueAnalyzer:
+    """Отвечает только за анализ выручки"""
+
+    def analyze_revenue(self, orders: List[Order], customers: Dict[int, Customer],
+                        aggregates: Optional[ItemAggregates] = None) -> RevenueMetrics:
+        if aggregates is None:
+            aggregates = _aggregate_orders(orders)
+
+        revenue = _RevenueAccumulator()
+        for order, order_cents, order_grams in zip(orders, aggregates.order_cents,
+                                                   aggregates.order_grams):
+            customer = customers.get(order.customer_id)
+            if customer:
+                revenue.add(order, customer, order_cents, order_grams)
+
+        return revenue.result()
+
+
+class CustomerAnalyzer:
+    """Отвечает только за анализ клиентов"""
+
+    def analyze_customers(self, orders: List[Order], customers: Dict[int, Customer],
+                          aggregates: Optional[ItemAggregates] = None) -> CustomerMetrics:
+        if aggregates is None:
+            aggregates = _aggregate_orders(orders)
+
+        customer_stats = _CustomerAccumulator()
+        for order, order_cents, order_quantity in zip(orders, aggregates.order_cents,
+                                                      aggregates.order_quantities):
+            customer = customers.get(order.customer_id)
+            if customer:
+                customer_stats.add(order, customer, order_cents, order_quantity)
+
+        return customer_stats.result(len(orders))
+
+
 class CategoryAnalyzer:
     """Отвечает только за анализ категорий товаров"""
 
-    def analyze_categories(self, orders: List[Order]) -> CategoryMetrics:
+    def analyze_categories(self, orders: List[Order],
+                           aggregates: Optional[ItemAggregates] = None) -> CategoryMetrics:
+        if aggregates is None:
+            aggregates = _aggregate_orders(orders)
+
+        # Категории в порядке первого появления, как при обходе заказов;
+        # в списке только встреченные категории, поэтому count всегда > 0
         stats = {}
+        for index in aggregates.category_order:
+            count = aggregates.category_counts[index]
+            revenue = Money.from_cents(aggregates.category_cents[index])
+            stats[_CATEGORIES[index]] = {
+                "count": count,
+                "revenue": revenue,
+                "avg_price": Money._unchecked(revenue.amount / Decimal(count))
+            }
 
-        for order in orders:
-            category_counts = OrderCalculator.count_items_by_category(order.items)
+        return CategoryMetrics(stats=stats)
 
-            for item in order.items:
-                category = item.product.category
-                if category not in stats:
-                    stats[category] = {
-                        "count": 0,
-                        "revenue": Money(Decimal('0')),
-                        "avg_price": Money(Decimal('0'))
-                    }
-
-                stats[category]["count"] += item.quantity
-                stats[category]["revenue"] += item.total_price()
-
-        # Расчёт средних цен
-        for category_stats in stats.values():
-            if category_stats["count"] > 0:
-                avg_amount = category_stats["revenue"].amount / Decimal(str(category_stats["count"]))
-                category_stats["avg_price"] = Money(avg_amount)
 
-        return CategoryMetrics(stats=stats)
+class FusedAnalyzer:
+    """Считает метрики выручки, клиентов и категорий за один проход по заказам"""
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers
+        self.category_analyzer = CategoryAnalyzer()
+
+    def analyze(self, orders: List[Order], customers: Dict[int, Customer]
+                ) -> Tuple[RevenueMetrics, CustomerMetrics, CategoryMetrics]:
+        # Позиции заказов сворачиваются в суммы один раз на весь отчёт
+        aggregates = _aggregate_orders(orders, self.workers)
+
+        revenue = _RevenueAccumulator()
+        customer_stats = _CustomerAccumulator()
+        for order, order_cents, order_grams, order_quantity in zip(
+                orders, aggregates.order_cents, aggregates.order_grams,
+                aggregates.order_quantities):
+            customer = customers.get(order.customer_id)
+            if not customer:
+                continue
+
+            revenue.add(order, customer, order_cents, order_grams)
+            customer_stats.add(order, customer, order_cents, order_quantity)
+
+        return (
+            revenue.result(),
+            customer_stats.result(len(orders)),
+            self.category_analyzer.analyze_categories(orders, aggregates)
+        )
 
 
 class DataValidator:
@@ -675,6 +1003,10 @@ class DataValidator:
         return warnings
 
 
+_SEGMENT_PREFIXES = {customer_type: customer_type.display_prefix().strip()
+                     for customer_type in CustomerType}
+
+
 class ReportFormatter:
     """Отвечает только за форматирование отчётов"""
 
@@ -683,71 +1015,73 @@ class ReportFormatter:
                                     category_metrics: CategoryMetrics,
                                     orders_count: int,
                                     warnings: List[str]) -> str:
-        lines = []
-        lines.append("=" * 50)
-        lines.append("📊 COMPREHENSIVE E-COMMERCE REPORT")
-        lines.append("=" * 50)
-        lines.append(f"📦 Total Orders: {orders_count}")
-        lines.append(f"💰 Revenue (Net): {revenue.net_revenue}")
-        lines.append(f"💰 Revenue (Gross): {revenue.gross_revenue}")
-        lines.append(f"🚚 Shipping Revenue: {revenue.shipping_revenue}")
-        lines.append(f"🎁 Discounts Given: {revenue.discounts_given}")
-        lines.append(f"📈 Avg Items/Order: {customer_metrics.avg_items_per_order:.2f}")
+        separator = "=" * 50
+        lines = [
+            separator,
+            "📊 COMPREHENSIVE E-COMMERCE REPORT",
+            separator,
+            f"📦 Total Orders: {orders_count}",
+            f"💰 Revenue (Net): {revenue.net_revenue}",
+            f"💰 Revenue (Gross): {revenue.gross_revenue}",
+            f"🚚 Shipping Revenue: {revenue.shipping_revenue}",
+            f"🎁 Discounts Given: {revenue.discounts_given}",
+            f"📈 Avg Items/Order: {customer_metrics.avg_items_per_order:.2f}",
+        ]
 
         # Топ клиенты
         lines.append("\n🏆 TOP CUSTOMERS (by revenue):")
-        sorted_customers = sorted(
-            customer_metrics.top_customers.items(),
-            key=lambda x: x[1]["revenue"].amount,
-            reverse=True
-        )[:5]
-
-        for i, (cid, stats) in enumerate(sorted_customers):
-            lines.append(f"  {i + 1}. Customer {cid}: {stats['revenue']} ({stats['orders']} orders)")
+        sorted_customers = heapq.nlargest(
+            5,
+            ((cid, stats["revenue"].amount, stats)
+             for cid, stats in customer_metrics.top_customers.items()),
+            key=itemgetter(1)
+        )
+        lines.extend(
+            f"  {i + 1}. Customer {cid}: {stats['revenue']} ({stats['orders']} orders)"
+            for i, (cid, _, stats) in enumerate(sorted_customers)
+        )
 
         # Категории
         lines.append("\n📊 CATEGORY PERFORMANCE:")
-        sorted_categories = sorted(
-            category_metrics.stats.items(),
-            key=lambda x: x[1]["count"],
-            reverse=True
-        )[:5]
-
-        for category, stats in sorted_categories:
-            lines.append(f"  {category.value}: {stats['count']} items, {stats['revenue']} revenue")
+        sorted_categories = heapq.nlargest(
+            5,
+            ((category, stats["count"], stats)
+             for category, stats in category_metrics.stats.items()),
+            key=itemgetter(1)
+        )
+        lines.extend(
+            f"  {category.value}: {count} items, {stats['revenue']} revenue"
+            for category, count, stats in sorted_categories
+        )
 
         # Сегменты клиентов
-        lines.append(f"\n👥 CUSTOMER SEGMENTS:")
-        for customer_type, count in customer_metrics.segments.items():
-            prefix = customer_type.display_prefix().strip()
-            lines.append(f"  {prefix} {customer_type.value}: {count}")
+        lines.append("\n👥 CUSTOMER SEGMENTS:")
+        lines.extend(
+            f"  {_SEGMENT_PREFIXES[customer_type]} {customer_type.value}: {count}"
+            for customer_type, count in customer_metrics.segments.items()
+        )
 
         # Предупреждения
         if warnings:
             lines.append(f"\n⚠️  WARNINGS ({len(warnings)}):")
-            for warning in warnings[:3]:
-                lines.append(f"  - {warning}")
+            lines.extend(f"  - {warning}" for warning in warnings[:3])
 
-        lines.append("=" * 50)
+        lines.append(separator)
         return "\n".join(lines)
 
 
 class Analytics:
     """Координирует анализ, но не делает всё сам"""
 
-    def __init__(self):
-        self.revenue_analyzer = RevenueAnalyzer()
-        self.customer_analyzer = CustomerAnalyzer()
-        self.category_analyzer = CategoryAnalyzer()
+    def __init__(self, workers: Optional[int] = None):
+        self.analyzer = FusedAnalyzer(workers)
         self.data_validator = DataValidator()
         self.report_formatter = ReportFormatter()
 
     def generate_comprehensive_report(self, orders: List[Order],
                                       customers: Dict[int, Customer]) -> Dict:
-        # Анализ различных аспектов
-        revenue_metrics = self.revenue_analyzer.analyze_revenue(orders, customers)
-        customer_metrics = self.customer_analyzer.analyze_customers(orders, customers)
-        category_metrics = self.category_analyzer.analyze_categories(orders)
+        # Анализ различных аспектов за один проход
+        revenue_metrics, customer_metrics, category_metrics = self.analyzer.analyze(orders, customers)
         warnings = self.data_validator.validate_customers(customers)
 
         # Форматированный вывод
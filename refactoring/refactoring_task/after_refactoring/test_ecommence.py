@@ -0,0 +1,74 @@
+"""
+test_ecommence.py
+Unit tests для отрефакторенного ecommence.py: суммы в центах и граммах не
+должны терять точность, если цена или вес не кратны центу или грамму.
+"""
+
+from contextlib import redirect_stdout
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+
+ecommence = pytest.importorskip(
+    "refactoring.refactoring_task.after_refactoring.ecommence",
+    reason="❌ Ошибка импорта! Убедитесь что файл ecommence.py находится в той же папке."
+)
+Money, Weight = ecommence.Money, ecommence.Weight
+Product, Order, Customer = ecommence.Product, ecommence.Order, ecommence.Customer
+ProductCategory, CustomerType = ecommence.ProductCategory, ecommence.CustomerType
+Analytics = ecommence.Analytics
+
+
+@pytest.fixture
+def fractional_product():
+    """Цена в долях цента и вес меньше грамма"""
+    return Product("Screw", Money(Decimal('0.125')), ProductCategory.OFFICE,
+                   Weight(Decimal('0.0005')))
+
+
+@pytest.fixture
+def book():
+    return Product("Book", Money(Decimal('25.00')), ProductCategory.BOOKS, Weight(Decimal('0.3')))
+
+
+def test_fractional_cents_price(fractional_product):
+    """Цена с долей цента принимается и суммируется точно"""
+    order = Order(1)
+    order.add_item(fractional_product, 3)
+
+    assert order.total_price().amount == Decimal('0.375')
+    assert str(order.total_price()) == "€0.38"
+
+
+def test_sub_gram_item_weight(fractional_product):
+    """Позиция с весом меньше грамма считает вес и цену точно"""
+    item = ecommence.OrderItem(fractional_product, 3)
+
+    assert item.total_weight().kilograms == Decimal('0.0015')
+    assert item.total_price().amount == Decimal('0.375')
+
+
+def test_sub_gram_order_weight(fractional_product, book):
+    """Вес меньше грамма не теряется в сумме заказа"""
+    order = Order(1)
+    order.add_item(fractional_product, 3)
+    order.add_item(book, 2)
+
+    assert order.total_weight().kilograms == Decimal('0.6015')
+
+
+def test_report_with_fractional_cents(fractional_product, book):
+    """Отчёт считает выручку по дробным центам так же, как по целым"""
+    order = Order(1)
+    order.add_item(fractional_product, 3)
+    order.add_item(book, 2)
+    customers = {1: Customer(1, "Alice", "alice@email.com", CustomerType.GOLD,
+                             Money(Decimal('100.00')), 1)}
+
+    with redirect_stdout(StringIO()):
+        report = Analytics().generate_comprehensive_report([order], customers)
+
+    assert report["total_revenue_net"] == Decimal('50.375')
+    assert report["categories_stats"]["office"]["revenue"].amount == Decimal('0.375')
+    assert report["categories_stats"]["books"]["revenue"].amount == Decimal('50.00')
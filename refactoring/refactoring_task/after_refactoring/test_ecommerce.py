@@ -5,312 +5,414 @@ Unit tests для проверки функциональности до реф
 что мы не сломали существующую логику.
 """
 
-import unittest
+from contextlib import redirect_stdout
 from io import StringIO
-from unittest.mock import patch
-
-# Импортируем наш код из файла ecommerce.py в той же папке
-try:
-    from refactoring.refactoring_task.before_refactoring.ecommerce import (
-        Product, Order, Customer, DiscountHelper, ShippingCalculator,
-        Analytics, OrderProcessor,
-        TAX_RATE, LOYALTY_DISCOUNT, FREE_SHIPPING_THRESHOLD,
-        PREMIUM_CUSTOMER_TYPE, GOLD_CUSTOMER_TYPE, REGULAR_CUSTOMER_TYPE
-    )
-except ImportError as e:
-    print("❌ Ошибка импорта! Убедитесь что файл ecommerce.py находится в той же папке.")
-    print(f"Детали ошибки: {e}")
-    exit(1)
-
-
-class TestProductAndOrder(unittest.TestCase):
-    """Тестируем базовую функциональность Product и Order"""
 
-    def setUp(self):
-        """Подготавливаем тестовые данные"""
-        self.product1 = Product("Book", 25.0, "books", 0.3)
-        self.product2 = Product("Pen", 5.0, "office", 0.1)
-        self.order = Order(customer_id=123)
+import pytest
+
+# Импортируем наш код из файла ecommerce.py в той же папке. Если модуля нет,
+# pytest пропускает файл, а не обрывает весь прогон (и соседние воркеры xdist)
+ecommerce = pytest.importorskip(
+    "refactoring.refactoring_task.before_refactoring.ecommerce",
+    reason="❌ Ошибка импорта! Убедитесь что файл ecommerce.py находится в той же папке."
+)
+Product, Order, Customer = ecommerce.Product, ecommerce.Order, ecommerce.Customer
+DiscountHelper, ShippingCalculator = ecommerce.DiscountHelper, ecommerce.ShippingCalculator
+Analytics, OrderProcessor = ecommerce.Analytics, ecommerce.OrderProcessor
+PREMIUM_CUSTOMER_TYPE = ecommerce.PREMIUM_CUSTOMER_TYPE
+GOLD_CUSTOMER_TYPE = ecommerce.GOLD_CUSTOMER_TYPE
+REGULAR_CUSTOMER_TYPE = ecommerce.REGULAR_CUSTOMER_TYPE
+
+
+# Все общие данные - pytest-фикстуры. Что тесты только читают, живёт весь
+# модуль; заказ и клиент, которых тест меняет, создаются заново для каждого теста.
+# Клиенты приходят из сессионной фикстуры customers в conftest.py
+
+
+@pytest.fixture(scope="module")
+def product1():
+    return Product("Book", 25.0, "books", 0.3)
+
+
+@pytest.fixture(scope="module")
+def product2():
+    return Product("Pen", 5.0, "office", 0.1)
+
+
+@pytest.fixture
+def order():
+    return Order(customer_id=123)
+
+
+@pytest.fixture
+def regular_customer():
+    """Свой клиент для теста, который его меняет: copy.copy не работает
+    с классами, собранными mypyc"""
+    return Customer(1, "John Doe", "john@email.com", REGULAR_CUSTOMER_TYPE, 100.0, 5)
 
-    def test_product_creation(self):
+
+class TestProductAndOrder:
+    """Тестируем базовую функциональность Product и Order"""
+
+    def test_product_creation(self, product1):
         """Тест создания продукта"""
-        self.assertEqual(self.product1.name, "Book")
-        self.assertEqual(self.product1.price, 25.0)
-        self.assertEqual(self.product1.category, "books")
-        self.assertEqual(self.product1.weight, 0.3)
+        assert product1.name == "Book"
+        assert product1.price == 25.0
+        assert product1.category == "books"
+        assert product1.weight == 0.3
 
-    def test_order_add_items(self):
+    def test_order_add_items(self, order, product1, product2):
         """Тест добавления товаров в заказ"""
-        self.order.add_item(self.product1, 2)
-        self.order.add_item(self.product2, 1)
+        order.add_item(product1, 2)
+        order.add_item(product2, 1)
 
         # Проверяем что товары добавились (с учётом примитивной реализации quantity)
-        self.assertEqual(len(self.order.items), 3)  # 2 книги + 1 ручка
-        self.assertEqual(self.order.customer_id, 123)
-        self.assertEqual(self.order.status, "OPEN")
+        assert len(order.items) == 3  # 2 книги + 1 ручка
+        assert order.customer_id == 123
+        assert order.status == "OPEN"
 
-    def test_order_total_price_methods(self):
+    def test_order_total_price_methods(self, order, product1, product2):
         """Тест методов подсчёта общей стоимости (включая дублированный код)"""
-        self.order.add_item(self.product1, 2)  # 2 * 25 = 50
-        self.order.add_item(self.product2, 1)  # 1 * 5 = 5
+        order.add_item(product1, 2)  # 2 * 25 = 50
+        order.add_item(product2, 1)  # 1 * 5 = 5
         # Итого: 55
 
         # Оба метода должны возвращать одинаковый результат (несмотря на duplicate code)
-        total1 = self.order.total_price()
-        total2 = self.order.grand_total()
+        total1 = order.total_price()
+        total2 = order.grand_total()
+
+        assert total1 == 55.0
+        assert total2 == 55.0
+        assert total1 == total2  # Проверяем что duplicate code работает одинаково
+
+    def test_order_totals_follow_items_changes(self, order, product1, product2):
+        """Суммы пересчитываются после любого изменения items, а не только add_item"""
+        order.add_item(product1, 2)
+        assert order.total_price() == 50.0
+
+        order.items.append(product1)
+        assert order.total_price() == 75.0
+        assert order.grand_total() == 75.0
 
-        self.assertEqual(total1, 55.0)
-        self.assertEqual(total2, 55.0)
-        self.assertEqual(total1, total2)  # Проверяем что duplicate code работает одинаково
+        order.items.clear()
+        order.items.append(product2)
+        assert order.total_price() == 5.0
+        assert order.calculate_shipping() == 5.99
 
-    def test_order_shipping_calculation(self):
+    def test_order_totals_follow_price_changes(self, order):
+        """Product изменяемый: новая цена и вес сразу видны в суммах заказа"""
+        product = Product("Lamp", 40.0, "home", 2.0)
+        order.add_item(product, 2)
+
+        product.price = 45.0
+        product.weight = 3.0
+
+        assert order.total_price() == 90.0
+        assert order.calculate_shipping() == 15.99  # вес 6 кг вместо 4
+
+    def test_order_totals_after_items_replaced(self, order, product1):
+        """Суммы считаются по новому списку, если items заменили целиком"""
+        order.add_item(product1)
+        order.items = [product1] * 6
+
+        assert order.total_price() == 150.0
+        assert order.grand_total() == 150.0
+
+    def test_order_shipping_calculation(self, order, product2):
         """Тест расчёта доставки"""
         # Заказ меньше FREE_SHIPPING_THRESHOLD
-        self.order.add_item(self.product2, 1)  # 5.0, weight 0.1
-        shipping = self.order.calculate_shipping()
-        self.assertEqual(shipping, 5.99)  # light weight, low price
+        order.add_item(product2, 1)  # 5.0, weight 0.1
+        shipping = order.calculate_shipping()
+        assert shipping == 5.99  # light weight, low price
 
         # Заказ больше FREE_SHIPPING_THRESHOLD
         expensive_product = Product("Laptop", 150.0, "electronics", 2.0)
         order2 = Order(456)
         order2.add_item(expensive_product, 1)
         shipping2 = order2.calculate_shipping()
-        self.assertEqual(shipping2, 0)  # free shipping over 100
+        assert shipping2 == 0  # free shipping over 100
 
-    def test_order_status_display(self):
+    def test_order_status_display(self, order):
         """Тест отображения статуса заказа"""
-        self.assertEqual(self.order.get_status_display(), "📝 Open")
+        assert order.get_status_display() == "📝 Open"
 
-        self.order.status = "SHIPPED"
-        self.assertEqual(self.order.get_status_display(), "🚚 Shipped")
+        order.status = "SHIPPED"
+        assert order.get_status_display() == "🚚 Shipped"
 
-        self.order.status = "UNKNOWN_STATUS"
-        self.assertEqual(self.order.get_status_display(), "❓ Unknown")
+        order.status = "UNKNOWN_STATUS"
+        assert order.get_status_display() == "❓ Unknown"
 
-    def test_order_status_permissions(self):
+    def test_order_status_permissions(self, order):
         """Тест проверки разрешений для статуса заказа"""
         # OPEN заказ можно отменить и изменить
-        self.order.status = "OPEN"
-        self.assertTrue(self.order.can_be_cancelled())
-        self.assertTrue(self.order.can_be_modified())
+        order.status = "OPEN"
+        assert order.can_be_cancelled()
+        assert order.can_be_modified()
 
         # SHIPPED заказ нельзя отменить и изменить
-        self.order.status = "SHIPPED"
-        self.assertFalse(self.order.can_be_cancelled())
-        self.assertFalse(self.order.can_be_modified())
+        order.status = "SHIPPED"
+        assert not order.can_be_cancelled()
+        assert not order.can_be_modified()
 
 
-class TestCustomerFunctionality(unittest.TestCase):
+class TestCustomerFunctionality:
     """Тестируем Large Class Customer и его множественные ответственности"""
 
-    def setUp(self):
-        self.regular_customer = Customer(1, "John Doe", "john@email.com",
-                                         REGULAR_CUSTOMER_TYPE, 100.0, 5)
-        self.premium_customer = Customer(2, "Jane Smith", "jane@email.com",
-                                         PREMIUM_CUSTOMER_TYPE, 500.0, 10)
-        self.gold_customer = Customer(3, "Bob Gold", "bob@email.com",
-                                      GOLD_CUSTOMER_TYPE, 2000.0, 25)
-
-    def test_customer_email_validation(self):
+    def test_customer_email_validation(self, customers):
         """Тест валидации email (часть Large Class проблемы)"""
-        self.assertTrue(self.regular_customer.is_valid_email())
+        assert customers["regular"].is_valid_email()
 
         invalid_customer = Customer(99, "Invalid", "invalid-email",
                                     REGULAR_CUSTOMER_TYPE, 0, 0)
-        self.assertFalse(invalid_customer.is_valid_email())
+        assert not invalid_customer.is_valid_email()
 
-    def test_customer_phone_validation(self):
+    def test_customer_phone_validation(self, regular_customer):
         """Тест валидации телефона"""
-        self.regular_customer.phone = "123-456-7890"
-        self.assertTrue(self.regular_customer.is_valid_phone())
+        customer = regular_customer
+        customer.phone = "123-456-7890"
+        assert customer.is_valid_phone()
 
-        self.regular_customer.phone = "123"
-        self.assertFalse(self.regular_customer.is_valid_phone())
+        customer.phone = "123"
+        assert not customer.is_valid_phone()
 
-    def test_customer_display_names(self):
+    def test_customer_display_names(self, customers):
         """Тест форматирования имён (ещё одна ответственность Large Class)"""
-        self.assertEqual(self.regular_customer.get_display_name(), "John Doe")
-        self.assertEqual(self.premium_customer.get_display_name(), "⭐ Jane Smith")
-        self.assertEqual(self.gold_customer.get_display_name(), "🥇 Bob Gold")
+        assert customers["regular"].get_display_name() == "John Doe"
+        assert customers["premium"].get_display_name() == "⭐ Jane Smith"
+        assert customers["gold"].get_display_name() == "🥇 Bob Gold"
 
-    def test_customer_loyalty_multipliers(self):
+    def test_customer_loyalty_multipliers(self, customers):
         """Тест бизнес-логики лояльности (тоже в Large Class)"""
-        self.assertEqual(self.regular_customer.get_loyalty_multiplier(), 0.05)
-        self.assertEqual(self.premium_customer.get_loyalty_multiplier(), 0.10)
-        self.assertEqual(self.gold_customer.get_loyalty_multiplier(), 0.15)
+        assert customers["regular"].get_loyalty_multiplier() == 0.05
+        assert customers["premium"].get_loyalty_multiplier() == 0.10
+        assert customers["gold"].get_loyalty_multiplier() == 0.15
 
-    def test_customer_free_shipping_eligibility(self):
+    def test_customer_free_shipping_eligibility(self, customers):
         """Тест права на бесплатную доставку"""
-        self.assertFalse(self.regular_customer.can_get_free_shipping())
-        self.assertTrue(self.premium_customer.can_get_free_shipping())
-        self.assertTrue(self.gold_customer.can_get_free_shipping())
+        assert not customers["regular"].can_get_free_shipping()
+        assert customers["premium"].can_get_free_shipping()
+        assert customers["gold"].can_get_free_shipping()
 
-    def test_customer_update_spent_amount(self):
+    def test_customer_update_spent_amount(self, regular_customer):
         """Тест обновления потраченной суммы"""
-        initial_spent = self.regular_customer.total_spent
-        initial_orders = self.regular_customer.orders_count
+        customer = regular_customer
+        initial_spent = customer.total_spent
+        initial_orders = customer.orders_count
 
-        self.regular_customer.update_spent_amount(50.0)
+        customer.update_spent_amount(50.0)
 
-        self.assertEqual(self.regular_customer.total_spent, initial_spent + 50.0)
-        self.assertEqual(self.regular_customer.orders_count, initial_orders + 1)
+        assert customer.total_spent == initial_spent + 50.0
+        assert customer.orders_count == initial_orders + 1
 
 
-class TestDiscountsAndShipping(unittest.TestCase):
-    """Тестируем Feature Envy классы DiscountHelper и ShippingCalculator"""
+# Сервисы без состояния и заказ, который тесты скидок и доставки только читают
+
+
+@pytest.fixture(scope="module")
+def discount_helper():
+    return DiscountHelper()
+
+
+@pytest.fixture(scope="module")
+def shipping_calc():
+    return ShippingCalculator()
+
 
-    def setUp(self):
-        self.discount_helper = DiscountHelper()
-        self.shipping_calc = ShippingCalculator()
+@pytest.fixture(scope="module")
+def bulk_product():
+    return Product("Test Product", 30.0, "test", 1.0)
 
-        # Создаём тестовые данные
-        self.product = Product("Test Product", 30.0, "test", 1.0)
-        self.order = Order(customer_id=1)
-        self.order.add_item(self.product, 3)  # 3 items, total 90.0
 
-        self.regular_customer = Customer(1, "John", "john@email.com",
-                                         REGULAR_CUSTOMER_TYPE, 100.0, 5)
-        self.premium_customer = Customer(2, "Jane", "jane@email.com",
-                                         PREMIUM_CUSTOMER_TYPE, 500.0, 10)
+@pytest.fixture(scope="module")
+def three_item_order(bulk_product):
+    order = Order(customer_id=1)
+    order.add_item(bulk_product, 3)  # 3 items, total 90.0
+    return order
 
-    def test_loyalty_discount_calculation(self):
+
+class TestDiscountsAndShipping:
+    """Тестируем Feature Envy классы DiscountHelper и ShippingCalculator"""
+
+    def test_loyalty_discount_calculation(self, discount_helper, three_item_order, customers):
         """Тест расчёта скидки лояльности (Feature Envy)"""
         # Regular customer needs 3+ items for discount
-        discount = self.discount_helper.calc_loyalty_discount(self.order, self.regular_customer)
+        discount = discount_helper.calc_loyalty_discount(three_item_order, customers["regular"])
         expected = 90.0 * 0.05  # base_price * regular_multiplier
-        self.assertEqual(discount, expected)
+        assert discount == expected
 
         # Premium customer needs 2+ items
-        discount_premium = self.discount_helper.calc_loyalty_discount(self.order, self.premium_customer)
+        discount_premium = discount_helper.calc_loyalty_discount(three_item_order, customers["premium"])
         expected_premium = 90.0 * 0.10
-        self.assertEqual(discount_premium, expected_premium)
+        assert discount_premium == expected_premium
 
-    def test_bulk_discount_calculation(self):
+    def test_bulk_discount_calculation(self, discount_helper, bulk_product):
         """Тест скидки за оптовую покупку"""
         # Создаём заказ с 5+ товарами одной категории
         bulk_order = Order(customer_id=1)
-        for _ in range(6):  # 6 товаров одной категории
-            bulk_order.add_item(self.product, 1)
+        bulk_order.add_item(bulk_product, 6)  # 6 товаров одной категории
 
-        discount = self.discount_helper.calc_bulk_discount(bulk_order)
+        discount = discount_helper.calc_bulk_discount(bulk_order)
         expected = 6 * 2.5  # count * magic_number
-        self.assertEqual(discount, expected)
+        assert discount == expected
+
+    def test_bulk_discount_after_items_replaced(self, discount_helper, bulk_product):
+        """Скидка считается по текущему списку items, даже если его заменили целиком"""
+        bulk_order = Order(customer_id=1)
+        bulk_order.items = [bulk_product] * 6
+
+        assert discount_helper.calc_bulk_discount(bulk_order) == 6 * 2.5
 
-    def test_advanced_shipping_calculation(self):
+    def test_advanced_shipping_calculation(self, shipping_calc, three_item_order, customers):
         """Тест продвинутого расчёта доставки (Feature Envy)"""
         # Regular customer
-        shipping = self.shipping_calc.calculate_advanced_shipping(self.order, self.regular_customer)
+        shipping = shipping_calc.calculate_advanced_shipping(three_item_order, customers["regular"])
         expected = 3.0 * 2.5 + 3.99  # total_weight * rate + base
-        self.assertEqual(shipping, expected)
+        assert shipping == expected
 
         # Premium customer with free shipping eligibility
         expensive_order = Order(customer_id=2)
         expensive_product = Product("Expensive", 60.0, "luxury", 1.0)
         expensive_order.add_item(expensive_product, 1)
 
-        shipping_premium = self.shipping_calc.calculate_advanced_shipping(expensive_order, self.premium_customer)
-        self.assertEqual(shipping_premium, 0)  # Free shipping
+        shipping_premium = shipping_calc.calculate_advanced_shipping(expensive_order, customers["premium"])
+        assert shipping_premium == 0  # Free shipping
 
 
-class TestAnalyticsReporting(unittest.TestCase):
-    """Тестируем Long Method в Analytics классе"""
+@pytest.fixture(scope="module")
+def analytics_customers():
+    return {
+        101: Customer(101, "Alice", "alice@email.com", GOLD_CUSTOMER_TYPE, 1000.0, 10),
+        102: Customer(102, "Bob", "bob@email.com", REGULAR_CUSTOMER_TYPE, 200.0, 3)
+    }
 
-    def setUp(self):
-        self.analytics = Analytics()
 
-        # Создаём тестовые данные
-        self.products = [
-            Product("Book", 25.0, "books", 0.5),
-            Product("Pen", 5.0, "office", 0.1),
-            Product("Laptop", 500.0, "electronics", 2.0)
-        ]
+@pytest.fixture(scope="module")
+def analytics_orders():
+    """Заказы для отчёта Analytics; отчёт их только читает"""
+    book = Product("Book", 25.0, "books", 0.5)
+    pen = Product("Pen", 5.0, "office", 0.1)
+    laptop = Product("Laptop", 500.0, "electronics", 2.0)
 
-        self.customers = {
-            101: Customer(101, "Alice", "alice@email.com", GOLD_CUSTOMER_TYPE, 1000.0, 10),
-            102: Customer(102, "Bob", "bob@email.com", REGULAR_CUSTOMER_TYPE, 200.0, 3)
-        }
+    order1 = Order(101)
+    order1.add_item(book, 2)  # 2 books = 50
+    order1.add_item(pen, 1)  # 1 pen = 5
+    order1.status = "DELIVERED"
+
+    order2 = Order(102)
+    order2.add_item(laptop, 1)  # 1 laptop = 500
+    order2.status = "SHIPPED"
 
-        # Создаём заказы
-        self.orders = []
+    return [order1, order2]
 
-        order1 = Order(101)
-        order1.add_item(self.products[0], 2)  # 2 books = 50
-        order1.add_item(self.products[1], 1)  # 1 pen = 5
-        order1.status = "DELIVERED"
-        self.orders.append(order1)
 
-        order2 = Order(102)
-        order2.add_item(self.products[2], 1)  # 1 laptop = 500
-        order2.status = "SHIPPED"
-        self.orders.append(order2)
+class TestAnalyticsReporting:
+    """Тестируем Long Method в Analytics классе"""
 
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_comprehensive_report_generation(self, mock_stdout):
+    def test_comprehensive_report_generation(self, analytics_orders, analytics_customers):
         """Тест генерации comprehensive report (Long Method)"""
-        report = self.analytics.generate_comprehensive_report(self.orders, self.customers)
+        # Перехватываем только sys.stdout, unittest.mock здесь не нужен
+        with redirect_stdout(StringIO()) as mock_stdout:
+            report = Analytics().generate_comprehensive_report(analytics_orders, analytics_customers)
 
         # Проверяем основные метрики
-        self.assertEqual(report["total_orders"], 2)
-        self.assertEqual(report["total_revenue_net"], 555.0)  # 55 + 500
+        assert report["total_orders"] == 2
+        assert report["total_revenue_net"] == 555.0  # 55 + 500
 
         # Проверяем что gross revenue включает налоги
         expected_gross = 555.0 * 1.2  # с налогом 20%
-        self.assertAlmostEqual(report["total_revenue_gross"], expected_gross, places=2)
+        assert report["total_revenue_gross"] == pytest.approx(expected_gross, abs=0.005)
 
         # Проверяем avg items per order
         expected_avg = (3 + 1) / 2  # (order1: 3 items, order2: 1 item) / 2 orders
-        self.assertEqual(report["avg_items_per_order"], expected_avg)
+        assert report["avg_items_per_order"] == expected_avg
 
         # Проверяем что есть данные по клиентам
-        self.assertIn(101, report["top_customers"])
-        self.assertIn(102, report["top_customers"])
+        assert set(report["top_customers"]) >= {101, 102}
 
         # Проверяем категории
-        self.assertIn("books", report["categories_stats"])
-        self.assertIn("office", report["categories_stats"])
-        self.assertIn("electronics", report["categories_stats"])
+        assert set(report["categories_stats"]) >= {"books", "office", "electronics"}
 
         # Проверяем сегменты клиентов
-        self.assertEqual(report["customer_segments"]["gold"], 1)
-        self.assertEqual(report["customer_segments"]["regular"], 1)
+        assert report["customer_segments"]["gold"] == 1
+        assert report["customer_segments"]["regular"] == 1
 
         # Проверяем что было логирование
-        self.assertGreater(len(report["debug_log"]), 0)
+        assert len(report["debug_log"]) > 0
 
         # Проверяем что отчёт был выведен на экран
         output = mock_stdout.getvalue()
-        self.assertIn("COMPREHENSIVE E-COMMERCE REPORT", output)
-        self.assertIn("Total Orders: 2", output)
-
-
-class TestPrimitiveObsessionAndOtherSmells(unittest.TestCase):
-    """Тестируем Primitive Obsession и другие code smells"""
-
-    def test_order_processor_payment_methods(self):
-        """Тест Switch Statement в OrderProcessor (Primitive Obsession)"""
-        processor = OrderProcessor()
-
-        # Тестируем разные валюты
-        self.assertTrue(processor.process_payment(100.0, "EUR", "CREDIT",
-                                                  "1234567890123456", "12/25", "123"))
-        self.assertTrue(processor.process_payment(100.0, "USD", "DEBIT",
-                                                  "1234567890123456", "12/25", "123"))
-        self.assertFalse(processor.process_payment(100.0, "INVALID", "CREDIT",
-                                                   "1234567890123456", "12/25", "123"))
-
-        # Тестируем разные способы оплаты
-        self.assertTrue(processor.process_payment(100.0, "EUR", "PAYPAL",
-                                                  "1234567890123456", "12/25", "123"))
-        self.assertFalse(processor.process_payment(100.0, "EUR", "BITCOIN",
-                                                   "1234567890123456", "12/25", "123"))
-
-        # Тестируем валидацию карты (примитивная проверка строк)
-        self.assertFalse(processor.process_payment(100.0, "EUR", "CREDIT",
-                                                   "123", "12/25", "123"))  # короткий номер
-        self.assertFalse(processor.process_payment(100.0, "EUR", "CREDIT",
-                                                   "1234567890123456", "12/25", "12"))  # короткий CVV
+        assert "COMPREHENSIVE E-COMMERCE REPORT" in output
+        assert "Total Orders: 2" in output
+
+    # Сборка mypyc проверяет типы атрибутов и принимает только int id
+    @pytest.mark.skipif(not ecommerce.__file__.endswith(".py"),
+                        reason="модуль собран mypyc")
+    def test_report_with_mixed_customer_ids(self, product1, product2):
+        """Id клиентов разных типов остаются как есть и находятся в customers"""
+        mixed_customers = {
+            1: Customer(1, "John Doe", "john@email.com", GOLD_CUSTOMER_TYPE, 2000.0, 25),
+            "vip": Customer("vip", "Jane Smith", "jane@email.com", PREMIUM_CUSTOMER_TYPE, 500.0, 10),
+        }
+        first_order, second_order = Order(customer_id=1), Order(customer_id="vip")
+        first_order.add_item(product2)
+        second_order.add_item(product1)
+
+        with redirect_stdout(StringIO()):
+            report = Analytics().generate_comprehensive_report([first_order, second_order],
+                                                               mixed_customers)
+
+        assert list(report["top_customers"]) == ["vip", 1]
+        assert report["customer_segments"] == {"gold": 1, "premium": 1, "regular": 0}
+
+    def test_report_follows_items_changes(self, product1, product2, analytics_customers):
+        """Отчёт видит товары, добавленные в items в обход add_item"""
+        changed_order = Order(customer_id=101)
+        changed_order.add_item(product1, 2)
+        changed_order.items.append(product2)
+
+        with redirect_stdout(StringIO()):
+            report = Analytics().generate_comprehensive_report([changed_order], analytics_customers)
+
+        assert report["total_revenue_net"] == 55.0
+        assert report["avg_items_per_order"] == 3
+        assert report["categories_stats"]["books"]["count"] == 2
+        assert report["categories_stats"]["office"]["revenue"] == 5.0
+
+
+# Switch Statement в OrderProcessor (Primitive Obsession): каждый случай -
+# отдельный параметризованный тест, который xdist может отдать своему воркеру
+CARD_NUMBER = "1234567890123456"
+PAYMENT_CASES = [
+    # Тестируем разные валюты
+    (100.0, "EUR", "CREDIT", CARD_NUMBER, "12/25", "123", True),
+    (100.0, "USD", "DEBIT", CARD_NUMBER, "12/25", "123", True),
+    (100.0, "INVALID", "CREDIT", CARD_NUMBER, "12/25", "123", False),
+    # Тестируем разные способы оплаты
+    (100.0, "EUR", "PAYPAL", CARD_NUMBER, "12/25", "123", True),
+    (100.0, "EUR", "BITCOIN", CARD_NUMBER, "12/25", "123", False),
+    # Тестируем валидацию карты (примитивная проверка строк)
+    (100.0, "EUR", "CREDIT", "123", "12/25", "123", False),  # короткий номер
+    (100.0, "EUR", "CREDIT", CARD_NUMBER, "12/25", "12", False),  # короткий CVV
+]
+
+
+@pytest.fixture(scope="module")
+def processor():
+    """OrderProcessor не хранит состояния, одного на модуль достаточно"""
+    # Настоящий объект, а не MagicMock(spec=OrderProcessor): process_payment -
+    # это несколько сравнений строк без внешних сервисов, вызов мока дороже,
+    # а тест с моком проверял бы сам мок вместо этих ветвлений
+    return OrderProcessor()
+
+
+@pytest.mark.parametrize("amount,currency,method,card,expiry,cvv,expected", PAYMENT_CASES)
+def test_order_processor_payment_methods(processor, amount, currency, method,
+                                         card, expiry, cvv, expected):
+    """Тест Switch Statement в OrderProcessor (Primitive Obsession)"""
+    assert processor.process_payment(amount, currency, method,
+                                     card, expiry, cvv) is expected
 
 
 if __name__ == "__main__":
-    # Запускаем все тесты
-    unittest.main(verbosity=2)
\ No newline at end of file
+    # Запускаем все тесты параллельно: каждый тестовый класс уходит на свой воркер
+    raise SystemExit(pytest.main([__file__, "-n", "auto", "--dist=loadscope"]))
\ No newline at end of file
@@ -0,0 +1,36 @@
+"""
+conftest.py
+Настройка pytest для test_ecommerce.py.
+
+Тесты независимы и не разделяют изменяемого состояния, поэтому их можно
+запускать параллельно через pytest-xdist:
+
+    pytest test_ecommerce.py -n auto --dist=loadscope
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Корень репозитория должен быть в sys.path, чтобы импорт
+# refactoring.refactoring_task... работал при запуске через `pytest`
+# из любой папки и в каждом воркере xdist
+REPO_ROOT = Path(__file__).resolve().parents[3]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+@pytest.fixture(scope="session")
+def customers():
+    """Клиенты, общие для всей сессии, только для чтения"""
+    ecommerce = pytest.importorskip("refactoring.refactoring_task.before_refactoring.ecommerce")
+    Customer = ecommerce.Customer
+    return {
+        "regular": Customer(1, "John Doe", "john@email.com",
+                            ecommerce.REGULAR_CUSTOMER_TYPE, 100.0, 5),
+        "premium": Customer(2, "Jane Smith", "jane@email.com",
+                            ecommerce.PREMIUM_CUSTOMER_TYPE, 500.0, 10),
+        "gold": Customer(3, "Bob Gold", "bob@email.com",
+                         ecommerce.GOLD_CUSTOMER_TYPE, 2000.0, 25),
+    }
@@ -13,8 +13,19 @@
 8. God Class тенденции (Order делает слишком много)
 9. Long Parameter List
 10. Data Class (Product)
+
+Атрибуты классов и report объявлены с типами, модуль проходит mypy и
+собирается в C-расширение через mypyc (`mypyc ecommerce.py`). В сборке
+методы с результатом float возвращают 0.0 там, где Python вернул бы int 0.
 """
 
+from collections import Counter
+from enum import IntEnum
+from itertools import islice
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
 # Константы, но некоторые будут дублированы в коде 🙃
 TAX_RATE = 0.20
 LOYALTY_DISCOUNT = 0.05
@@ -24,8 +35,31 @@ GOLD_CUSTOMER_TYPE = 2
 REGULAR_CUSTOMER_TYPE = 0
 
 
+class Status(IntEnum):
+    OPEN = 0
+    PROCESSING = 1
+    SHIPPED = 2
+    DELIVERED = 3
+    CANCELLED = 4
+
+
+# Таблицы по номеру статуса вместо цепочек сравнений строк.
+# order.status по-прежнему строка, поэтому ищем номер по имени
+_STATUS_CODES = {status.name: status for status in Status}
+_STATUS_DISPLAY = ("📝 Open", "⚙️ Processing", "🚚 Shipped", "✅ Delivered", "❌ Cancelled")
+_CANCELLABLE_MASK = (1 << Status.OPEN) | (1 << Status.PROCESSING)
+_MODIFIABLE_MASK = 1 << Status.OPEN
+
+
 # ――― Data Class (только данные, нет поведения) ―――
 class Product:
+    __slots__ = ('name', 'price', 'category', 'weight')
+
+    name: str
+    price: float
+    category: str
+    weight: float
+
     def __init__(self, name: str, price: float, category: str, weight: float):
         self.name = name
         self.price = price
@@ -38,6 +72,21 @@ class Customer:
     """
     Делает всё: хранит данные, валидирует, форматирует, считает скидки...
     """
+    __slots__ = ('customer_id', 'name', 'email', 'customer_type', 'total_spent', 'orders_count',
+                 'address', 'phone', 'registration_date', 'last_login', 'preferences')
+
+    customer_id: int
+    name: str
+    email: str
+    customer_type: int
+    total_spent: float
+    orders_count: int
+    address: str
+    phone: str
+    registration_date: Optional[str]
+    last_login: Optional[str]
+    preferences: dict
+
     def __init__(self, customer_id: int, name: str, email: str,
                  customer_type: int, total_spent: float, orders_count: int):
         self.customer_id = customer_id
@@ -88,9 +137,20 @@ class Customer:
 
 # ――― God Class тенденции - Order делает слишком много ―――
 class Order:
+    __slots__ = ('customer_id', 'items', 'status', 'shipping_address', 'notes',
+                 'created_at', 'updated_at')
+
+    customer_id: int
+    items: list[Product]
+    status: str
+    shipping_address: str
+    notes: str
+    created_at: Optional[str]
+    updated_at: Optional[str]
+
     def __init__(self, customer_id: int):
         self.customer_id = customer_id
-        self.items: list[Product] = []
+        self.items = []
         self.status = "OPEN"  # Primitive Obsession - строка вместо enum
         self.shipping_address = ""
         self.notes = ""
@@ -98,33 +158,32 @@ class Order:
         self.updated_at = None
 
     def add_item(self, product: Product, quantity: int = 1):
-        # Примитивная реализация - не учитывает quantity правильно
-        for _ in range(quantity):
-            self.items.append(product)
+        # Примитивная реализация - не учитывает quantity правильно:
+        # товар по-прежнему кладётся quantity раз, но одним extend
+        self.items.extend([product] * quantity)
+
+    def _totals(self) -> tuple[float, float]:
+        """Общий вес и цена товаров за один проход по items"""
+        # Без кэша: items - публичный список, а цены и веса можно менять,
+        # поэтому суммы всегда считаются по текущим данным
+        total_weight = 0.0
+        total_price = 0.0
+        for item in self.items:
+            total_weight += item.weight
+            total_price += item.price
+        return total_weight, total_price
 
     # ――― Duplicate Code №1 ―――
     def total_price(self):
-        total = 0
-        for p in self.items:
-            total += p.price
-        return total
+        return self._totals()[1]
 
     # ――― Duplicate Code №2 (та же логика, другая реализация) ―――
     def grand_total(self):
-        s = 0
-        for p in self.items:
-            s += p.price
-        return s
+        return self._totals()[1]
 
     # ――― Duplicate Code №3 (похожая логика подсчёта) ―――
     def calculate_shipping(self):
-        total_weight = 0
-        for p in self.items:
-            total_weight += p.weight
-
-        base_price = 0
-        for p in self.items:  # Опять итерируемся по items
-            base_price += p.price
+        total_weight, base_price = self._totals()
 
         if base_price > 100:  # Magic Number вместо FREE_SHIPPING_THRESHOLD
             return 0
@@ -135,26 +194,18 @@ class Order:
         else:
             return 15.99  # Magic Number
 
-    # Switch Statement - можно заменить полиморфизмом
+    # Switch Statement заменён таблицей, но статус всё ещё строка
     def get_status_display(self):
-        if self.status == "OPEN":
-            return "📝 Open"
-        elif self.status == "PROCESSING":
-            return "⚙️ Processing"
-        elif self.status == "SHIPPED":
-            return "🚚 Shipped"
-        elif self.status == "DELIVERED":
-            return "✅ Delivered"
-        elif self.status == "CANCELLED":
-            return "❌ Cancelled"
-        else:
-            return "❓ Unknown"
+        code = _STATUS_CODES.get(self.status)
+        return "❓ Unknown" if code is None else _STATUS_DISPLAY[code]
 
     def can_be_cancelled(self):
-        return self.status in ["OPEN", "PROCESSING"]
+        code = _STATUS_CODES.get(self.status)
+        return code is not None and bool((1 << code) & _CANCELLABLE_MASK)
 
     def can_be_modified(self):
-        return self.status == "OPEN"
+        code = _STATUS_CODES.get(self.status)
+        return code is not None and bool((1 << code) & _MODIFIABLE_MASK)
 
 
 # ――― Feature Envy - лезет в чужие данные ―――
@@ -179,31 +230,17 @@ class DiscountHelper:
         return base_price * customer_multiplier if num_items >= minimum_items else 0.0
 
     def calc_bulk_discount(self, order: Order) -> float:
-        # Feature Envy - опять лезет в order.items
-        category_counts = {}
-        for item in order.items:
-            if item.category not in category_counts:
-                category_counts[item.category] = 0
-            category_counts[item.category] += 1
-
-        discount = 0
-        for category, count in category_counts.items():
-            if count >= 5:  # Magic Number
-                discount += count * 2.5  # Magic Number
-        return discount
+        # Feature Envy - опять лезет во внутренности order
+        category_counts = Counter(product.category for product in order.items)
+        # Magic Numbers: от 5 товаров категории скидка 2.5 за товар
+        return sum(count * 2.5 for count in category_counts.values() if count >= 5)
 
 
 # ――― Ещё один Feature Envy ―――
 class ShippingCalculator:
     def calculate_advanced_shipping(self, order: Order, customer: Customer) -> float:
         # Дублирует логику из Order.calculate_shipping но с другими правилами
-        total_weight = 0
-        for p in order.items:
-            total_weight += p.weight
-
-        base_price = 0
-        for p in order.items:
-            base_price += p.price
+        total_weight, base_price = order._totals()
 
         # Feature Envy - использует internal knowledge о customer
         if customer.can_get_free_shipping() and base_price > 50:  # Magic Number
@@ -217,21 +254,33 @@ class ShippingCalculator:
             return total_weight * 2.5 + 3.99  # Magic Numbers
 
 
+def _factorize(values: Iterable[Any]) -> tuple[list[Any], np.ndarray]:
+    """Уникальные значения в порядке первого появления и номер каждого значения"""
+    # dict, а не np.unique: ключи могут быть любыми hashable, в том числе
+    # разных типов, и остаются исходными объектами
+    index: dict[Any, int] = {}
+    codes = np.fromiter((index.setdefault(value, len(index)) for value in values), dtype=np.intp)
+    return list(index), codes
+
+
 # ――― Long Method + множественные нарушения SRP ―――
 class Analytics:
-    def generate_comprehensive_report(self, orders: list[Order], customers: dict[int, Customer]) -> dict:
+    def generate_comprehensive_report(self, orders: list[Order], customers: dict[int, Customer],
+                                      debug: bool = True) -> dict:
         """
         100+ строк монстр-метод, который делает ВСЁ:
         - агрегацию данных
         - сложные вычисления
-        - логирование
+        - логирование (только при debug=True)
         - форматирование
         - вывод на экран
         - валидацию
         - сортировку
         """
         # Long Parameter List было бы ещё хуже, но пока обойдёмся
-        report = {
+        # Значения разных типов в одном dict - ещё один smell; Any нужен,
+        # чтобы mypy/mypyc пропускали доступ к вложенным dict и list
+        report: dict[str, Any] = {
             "total_orders": len(orders),
             "total_revenue_net": 0.0,
             "total_revenue_gross": 0.0,
@@ -246,61 +295,83 @@ class Analytics:
             "warnings": []
         }
 
-        total_items = 0
         discount_helper = DiscountHelper()
         shipping_calc = ShippingCalculator()
+        # Сырые значения для debug_log; строки собираются одним проходом в конце
+        debug_rows = []
 
         # ――― Блок 1: основная агрегация (слишком много в одном месте) ―――
-        for order in orders:
-            # Duplicate Code - та же логика подсчёта, что в Order
-            net_price = 0
-            for item in order.items:
-                net_price += item.price
-
-            tax_amount = net_price * 0.2  # Magic Number дублирует TAX_RATE
-            gross_price = net_price + tax_amount
+        # Собираем цены товаров всех заказов в общий массив прямо из items,
+        # чтобы отчёт видел и изменения списка в обход add_item;
+        # order_idx - номер заказа для каждого товара
+        lengths = np.fromiter((len(o.items) for o in orders), dtype=np.intp, count=len(orders))
+        all_prices = np.fromiter((p.price for o in orders for p in o.items),
+                                 dtype=np.float64, count=int(lengths.sum()))
+        order_idx = np.repeat(np.arange(len(orders)), lengths)
+
+        # bincount суммирует слева направо, как и цикл по items
+        net_prices = np.bincount(order_idx, weights=all_prices, minlength=len(orders))
+        tax_amounts = net_prices * 0.2  # Magic Number дублирует TAX_RATE
+        gross_prices = net_prices + tax_amounts
+
+        # ――― Блок 3: топ клиенты и сегменты ―――
+        # Номер клиента для каждого заказа; клиенты идут в порядке первого
+        # заказа, как при заполнении dict
+        if orders:
+            customer_ids, cust_idx = _factorize(o.customer_id for o in orders)
+            customer_revenue = np.bincount(cust_idx, weights=gross_prices, minlength=len(customer_ids))
+            customer_orders = np.bincount(cust_idx, minlength=len(customer_ids))
+            # Стабильная сортировка по убыванию выручки, как sorted(reverse=True)
+            ranking = np.argsort(-customer_revenue, kind="stable")
+            for i in ranking.tolist():
+                report["top_customers"][customer_ids[i]] = {
+                    "revenue": float(customer_revenue[i]),
+                    "orders": int(customer_orders[i]),
+                    "avg_order": 0
+                }
 
-            report["total_revenue_net"] += net_price
-            report["total_revenue_gross"] += gross_price
-            total_items += len(order.items)
+            # Сегмент клиента: 2 - gold, 1 - premium, остальное - regular;
+            # -1 - клиента нет в customers, такие заказы не считаются
+            segments = np.array([
+                -1 if customers.get(cid) is None
+                else 2 if customers[cid].customer_type == 2
+                else 1 if customers[cid].customer_type == 1
+                else 0
+                for cid in customer_ids
+            ], dtype=np.intp)
+            known = segments >= 0
+            segment_orders = np.bincount(segments[known], weights=customer_orders[known], minlength=3)
+            report["customer_segments"] = {
+                "gold": int(segment_orders[2]),
+                "premium": int(segment_orders[1]),
+                "regular": int(segment_orders[0])
+            }
+
+        net_prices, gross_prices = net_prices.tolist(), gross_prices.tolist()
+        report["total_revenue_net"] = sum(net_prices, 0.0)
+        report["total_revenue_gross"] = sum(gross_prices, 0.0)
+        total_items = len(all_prices)
+
+        # ――― Блок 4: анализ категорий товаров ―――
+        # Порядок категорий - по первому появлению, как при заполнении dict
+        categories, cat_idx = _factorize(p.category for o in orders for p in o.items)
+        if categories:
+            cat_counts = np.bincount(cat_idx, minlength=len(categories))
+            cat_revenue = np.bincount(cat_idx, weights=all_prices, minlength=len(categories))
+            for i, category in enumerate(categories):
+                report["categories_stats"][category] = {
+                    "count": int(cat_counts[i]),
+                    "revenue": float(cat_revenue[i]),
+                    "avg_price": 0
+                }
 
+        for order, net_price, gross_price in zip(orders, net_prices, gross_prices):
             # ――― Блок 2: анализ доставки ―――
             customer = customers.get(order.customer_id)
             if customer:
                 shipping_cost = shipping_calc.calculate_advanced_shipping(order, customer)
                 report["total_shipping"] += shipping_cost
 
-                # Customer segmentation с Magic Numbers
-                if customer.customer_type == 2:
-                    report["customer_segments"]["gold"] += 1
-                elif customer.customer_type == 1:
-                    report["customer_segments"]["premium"] += 1
-                else:
-                    report["customer_segments"]["regular"] += 1
-
-            # ――― Блок 3: топ клиенты (можно было бы вынести) ―――
-            cid = order.customer_id
-            if cid not in report["top_customers"]:
-                report["top_customers"][cid] = {
-                    "revenue": 0,
-                    "orders": 0,
-                    "avg_order": 0
-                }
-            report["top_customers"][cid]["revenue"] += gross_price
-            report["top_customers"][cid]["orders"] += 1
-
-            # ――― Блок 4: анализ категорий товаров ―――
-            for item in order.items:
-                cat = item.category
-                if cat not in report["categories_stats"]:
-                    report["categories_stats"][cat] = {
-                        "count": 0,
-                        "revenue": 0,
-                        "avg_price": 0
-                    }
-                report["categories_stats"][cat]["count"] += 1
-                report["categories_stats"][cat]["revenue"] += item.price
-
             # ――― Блок 5: скидки и детальное логирование ―――
             if customer:
                 loyalty_discount = discount_helper.calc_loyalty_discount(order, customer)
@@ -309,16 +380,9 @@ class Analytics:
                 report["total_discounts"] += total_discount
 
                 # Подробное логирование (не нужно в production)
-                log_entry = (
-                    f"[Customer: {customer.name}] "
-                    f"Order: {len(order.items)} items, "
-                    f"Net: €{net_price:.2f}, "
-                    f"Gross: €{gross_price:.2f}, "
-                    f"Shipping: €{shipping_cost:.2f}, "
-                    f"Discount: €{total_discount:.2f}, "
-                    f"Status: {order.status}"
-                )
-                report["debug_log"].append(log_entry)
+                if debug:
+                    debug_rows.append((customer.name, len(order.items), net_price, gross_price,
+                                       shipping_cost, total_discount, order.status))
 
                 # Валидация данных клиента (не место для этого здесь)
                 if not customer.is_valid_email():
@@ -326,6 +390,18 @@ class Analytics:
                 if not customer.is_valid_phone():
                     report["warnings"].append(f"Invalid phone for customer {customer.name}")
 
+        report["debug_log"] = [
+            f"[Customer: {name}] "
+            f"Order: {items_count} items, "
+            f"Net: €{net_price:.2f}, "
+            f"Gross: €{gross_price:.2f}, "
+            f"Shipping: €{shipping_cost:.2f}, "
+            f"Discount: €{total_discount:.2f}, "
+            f"Status: {status}"
+            for name, items_count, net_price, gross_price, shipping_cost, total_discount, status
+            in debug_rows
+        ]
+
         # ――― Блок 6: пост-обработка и вычисления ―――
         if orders:
             report["avg_items_per_order"] = round(total_items / len(orders), 2)
@@ -345,15 +421,7 @@ class Analytics:
                 )
 
         # ――― Блок 7: сортировки (много кода для простой задачи) ―――
-        # Сортируем топ клиентов по выручке
-        report["top_customers"] = dict(
-            sorted(
-                report["top_customers"].items(),
-                key=lambda kv: kv[1]["revenue"],
-                reverse=True
-            )
-        )
-
+        # Топ клиентов уже собран в порядке убывания выручки (Блок 3)
         # Сортируем категории по популярности
         report["categories_stats"] = dict(
             sorted(
@@ -375,12 +443,13 @@ class Analytics:
         print(f"📈 Avg Items/Order: {report['avg_items_per_order']}")
 
         print("\n🏆 TOP CUSTOMERS (by revenue):")
-        for i, (cid, stats) in enumerate(list(report["top_customers"].items())[:5]):
+        # Словари уже отсортированы, берём первые 5 без копии в список
+        for i, (cid, stats) in enumerate(islice(report["top_customers"].items(), 5)):
             customer_name = customers[cid].get_display_name() if cid in customers else f"Customer {cid}"
             print(f"  {i+1}. {customer_name}: €{stats['revenue']:.2f} ({stats['orders']} orders)")
 
         print("\n📊 CATEGORY PERFORMANCE:")
-        for cat, stats in list(report["categories_stats"].items())[:5]:
+        for cat, stats in islice(report["categories_stats"].items(), 5):
             print(f"  {cat}: {stats['count']} items, €{stats['revenue']:.2f} revenue")
 
         print(f"\n👥 CUSTOMER SEGMENTS:")
@@ -390,7 +459,7 @@ class Analytics:
 
         if report["warnings"]:
             print(f"\n⚠️  WARNINGS ({len(report['warnings'])}):")
-            for warning in report["warnings"][:3]:  # Показываем только первые 3
+            for warning in islice(report["warnings"], 3):  # Показываем только первые 3
                 print(f"  - {warning}")
 
         print("=" * 50)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+run_tests.py
+Параллельный запуск всех test_*.py из refactoring_task.
+
+Файлы делятся на (ядра - 2) шарда, каждый шард запускается отдельным
+процессом pytest. Два ядра остаются свободными, чтобы машина не зависала.
+
+    python run_tests.py
+"""
+
+import os
+import subprocess
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+TASK_DIR = Path(__file__).resolve().parent / "refactoring_task"
+RESERVED_CORES = 2
+PYTEST_ARGS = ["--no-header", "-q", "-p", "no:cacheprovider"]
+
+
+def find_test_files() -> list[Path]:
+    # Сортировка по имени файла ставит одноимённые тесты рядом
+    return sorted(TASK_DIR.glob("**/test_*.py"), key=lambda path: (path.name, str(path)))
+
+
+def shards_count(files: list[Path]) -> int:
+    cores = max(1, (os.cpu_count() or 1) - RESERVED_CORES)
+    # Одноимённые test_*.py без __init__.py нельзя собрать в одном процессе
+    # pytest, поэтому шардов должно быть не меньше, чем таких дубликатов
+    duplicates = max(Counter(path.name for path in files).values(), default=1)
+    return min(len(files), max(cores, duplicates))
+
+
+def make_shards(files: list[Path], count: int) -> list[list[Path]]:
+    return [files[i::count] for i in range(count)]
+
+
+def run_shard(shard: list[Path]) -> subprocess.CompletedProcess:
+    command = [sys.executable, "-m", "pytest", *PYTEST_ARGS, *map(str, shard)]
+    return subprocess.run(command, capture_output=True, text=True)
+
+
+def main() -> int:
+    files = find_test_files()
+    if not files:
+        print("❌ Тесты не найдены")
+        return 1
+
+    shards = make_shards(files, shards_count(files))
+    # Потоки только ждут дочерние процессы, сама работа идёт в pytest
+    with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+        results = list(executor.map(run_shard, shards))
+
+    for shard, result in zip(shards, results):
+        names = ", ".join(str(path.relative_to(TASK_DIR)) for path in shard)
+        print(f"――― {names} ―――")
+        print(result.stdout, end="")
+        print(result.stderr, end="", file=sys.stderr)
+
+    return max(result.returncode for result in results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
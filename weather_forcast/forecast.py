@@ -5,10 +5,13 @@ for a given geographical region using historical weather data.
 """
 
 import argparse
+import hashlib
+import math
+import re
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.ensemble import HistGradientBoostingRegressor
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 import joblib
@@ -17,6 +20,12 @@ import logging
 from typing import Dict, List, Tuple, Optional
 import json
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional, pandas rolling is used without it
+    njit = None
+    prange = range
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -26,12 +35,152 @@ logger = logging.getLogger(__name__)
 
 # Constants
 TARGETS = ['temperature', 'humidity', 'pressure']
+# max_iter is an upper bound: with enough training rows each fit stops once
+# the loss on a held-out 10% of them has not improved for 10 iterations
 MODEL_PARAMS = {
-    'n_estimators': 200,
+    'max_iter': 200,
     'max_depth': 5,
     'learning_rate': 0.1,
-    'random_state': 42
+    'random_state': 42,
+    'early_stopping': True,
+    'n_iter_no_change': 10,
+    'validation_fraction': 0.1,
+    'tol': 1e-4
 }
+# Below this many training rows the held-out 10% is too small to judge the
+# loss, the fits stop after a few trees and multi-day forecasts come out flat
+MIN_EARLY_STOPPING_SAMPLES = 1000
+# Observed (min, max) of each target, in TARGETS order
+VALUE_RANGES = np.array([
+    [1.6, 20.6],
+    [40.0, 96.0],
+    [998.1, 1032.7]
+])
+ROLLING_WINDOW = 7
+ROLLING_STATS = ['mean', 'std', 'min', 'max']
+# Engineered feature columns, in the order make_features adds them
+FEATURE_COLUMNS = (
+    ['sin_month', 'cos_month', 'sin_day', 'cos_day']
+    + [f'{col}_rolling_{stat}_7d' for col in TARGETS for stat in ROLLING_STATS]
+    + [f'{col}_lag_1' for col in TARGETS]
+)
+# Bump when make_features changes so cached features are rebuilt
+FEATURE_VERSION = 4
+# All trained models in one uncompressed file, so it can be memory-mapped
+MODELS_FILE = 'models.joblib'
+MODELS_DIR = Path('models')
+# The only features cache; kept apart from the models so it can be ignored by git
+FEATURE_CACHE_DIR = MODELS_DIR / 'cache'
+
+
+def _rolling_stats_kernel(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Compute rolling mean, std, min and max of every column in a single pass.
+    
+    Matches pandas ``rolling(window, min_periods=1)``: mean and std are kept
+    with Welford add/remove updates, min and max with monotonic index deques.
+    Columns are independent and run in parallel when compiled with numba.
+    
+    Args:
+        x: 2D float64 array (rows x columns)
+        window: Rolling window length
+        
+    Returns:
+        Array of shape (rows, columns * 4) with mean, std, min, max per column
+    """
+    n_rows, n_cols = x.shape
+    out = np.empty((n_rows, n_cols * 4))
+    
+    for j in prange(n_cols):
+        # Per-column deques, so parallel columns share no scratch memory
+        min_deque = np.empty(n_rows, dtype=np.int64)
+        max_deque = np.empty(n_rows, dtype=np.int64)
+        count = 0
+        mean = 0.0
+        m2 = 0.0
+        min_head = min_tail = max_head = max_tail = 0
+        
+        for i in range(n_rows):
+            value = x[i, j]
+            count += 1
+            delta = value - mean
+            mean += delta / count
+            m2 += delta * (value - mean)
+            
+            if i >= window:
+                old = x[i - window, j]
+                count -= 1
+                delta = old - mean
+                mean -= delta / count
+                m2 -= delta * (old - mean)
+            
+            while min_tail > min_head and x[min_deque[min_tail - 1], j] >= value:
+                min_tail -= 1
+            min_deque[min_tail] = i
+            min_tail += 1
+            if min_deque[min_head] <= i - window:
+                min_head += 1
+            
+            while max_tail > max_head and x[max_deque[max_tail - 1], j] <= value:
+                max_tail -= 1
+            max_deque[max_tail] = i
+            max_tail += 1
+            if max_deque[max_head] <= i - window:
+                max_head += 1
+            
+            low = x[min_deque[min_head], j]
+            high = x[max_deque[max_head], j]
+            
+            out[i, 4 * j] = mean
+            if count > 1:
+                # A window of equal values has zero variance, as in pandas
+                variance = 0.0 if low == high else max(m2 / (count - 1), 0.0)
+                out[i, 4 * j + 1] = math.sqrt(variance)
+            else:
+                out[i, 4 * j + 1] = np.nan
+            out[i, 4 * j + 2] = low
+            out[i, 4 * j + 3] = high
+    
+    return out
+
+
+_rolling_stats = njit(parallel=True, cache=True)(_rolling_stats_kernel) if njit is not None else None
+
+
+def _rolling_stats_numpy(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Compute rolling mean, std, min and max of every column with NumPy.
+    
+    Used when numba is not available. Full windows are reduced over a
+    sliding_window_view of the input, while the shorter windows at the start
+    (min_periods=1) are reduced one by one.
+    
+    Args:
+        x: 2D float64 array (rows x columns), without NaN values
+        window: Rolling window length
+        
+    Returns:
+        Array of shape (rows, columns * 4) with mean, std, min, max per column
+    """
+    n_rows, n_cols = x.shape
+    out = np.empty((n_rows, n_cols, 4))
+    
+    def reduce_windows(windows: np.ndarray, rows: slice) -> None:
+        out[rows, :, 0] = windows.mean(axis=-1)
+        out[rows, :, 2] = low = windows.min(axis=-1)
+        out[rows, :, 3] = high = windows.max(axis=-1)
+        if windows.shape[-1] > 1:
+            # A window of equal values has zero variance, as in pandas
+            out[rows, :, 1] = np.where(low == high, 0.0, windows.std(axis=-1, ddof=1))
+        else:
+            out[rows, :, 1] = np.nan
+    
+    for i in range(min(window - 1, n_rows)):
+        reduce_windows(x[:i + 1].T[None], slice(i, i + 1))
+    if n_rows >= window:
+        reduce_windows(np.lib.stride_tricks.sliding_window_view(x, window, axis=0), slice(window - 1, None))
+    
+    return out.reshape(n_rows, n_cols * 4)
 
 
 def validate_data(df: pd.DataFrame) -> None:
@@ -39,24 +188,30 @@ def validate_data(df: pd.DataFrame) -> None:
     Validate the input data for required columns and value ranges.
     
     Args:
-        df: Input DataFrame with weather data
+        df: Input DataFrame with weather data, 'time' as a column or the index
         
     Raises:
         ValueError: If data validation fails
     """
     # Check required columns
     required_columns = ['time'] + TARGETS
-    missing_columns = [col for col in required_columns if col not in df.columns]
+    available_columns = set(df.columns) | {df.index.name}
+    missing_columns = [col for col in required_columns if col not in available_columns]
     if missing_columns:
         raise ValueError(f"Missing required columns: {missing_columns}")
     
-    # Check value ranges based on actual data
-    if (df['temperature'] < 1.6).any() or (df['temperature'] > 20.6).any():
-        raise ValueError("Temperature values out of observed range (1.6 to 20.6)")
-    if (df['humidity'] < 40).any() or (df['humidity'] > 96).any():
-        raise ValueError("Humidity values out of observed range (40 to 96)")
-    if (df['pressure'] < 998.1).any() or (df['pressure'] > 1032.7).any():
-        raise ValueError("Pressure values out of observed range (998.1 to 1032.7)")
+    # Check value ranges based on actual data: one min and one max pass
+    # over all targets instead of two comparisons per column
+    if len(df) == 0:
+        return
+    values = df[TARGETS].to_numpy(dtype=np.float64)
+    out_of_range = (values.min(axis=0) < VALUE_RANGES[:, 0]) | (values.max(axis=0) > VALUE_RANGES[:, 1])
+    if out_of_range.any():
+        column = int(np.argmax(out_of_range))
+        low, high = VALUE_RANGES[column]
+        raise ValueError(
+            f"{TARGETS[column].capitalize()} values out of observed range ({low:g} to {high:g})"
+        )
 
 
 def load_data(path_to_csv: str) -> pd.DataFrame:
@@ -70,24 +225,84 @@ def load_data(path_to_csv: str) -> pd.DataFrame:
         Preprocessed DataFrame with datetime index
     """
     logger.info(f"Loading data from {path_to_csv}")
-    df = pd.read_csv(path_to_csv)
+    # Explicit dtypes skip type inference for the measurement columns
+    df = pd.read_csv(path_to_csv, dtype={'time': str, **{target: np.float64 for target in TARGETS}})
+    
+    # ISO 8601 timestamps are cast by NumPy in a single C loop without
+    # format inference; other formats still go through pandas
+    if 'time' in df.columns:
+        times = df.pop('time')
+        try:
+            timestamps = times.str.replace('Z', '', regex=False).to_numpy().astype('datetime64[ns]')
+        except ValueError:
+            timestamps = pd.to_datetime(times)
+        df.index = pd.DatetimeIndex(timestamps, name='time')
     
     # Validate data
     validate_data(df)
     
-    # Convert time column to datetime
-    df['time'] = pd.to_datetime(df['time'])
-    df.set_index('time', inplace=True)
-    df.sort_index(inplace=True)
+    # Weather logs are usually chronological already
+    if not df.index.is_monotonic_increasing:
+        df.sort_index(inplace=True)
     
-    # Check for missing values
-    if df.isnull().any().any():
+    # Check for missing values with one NaN scan over the numeric block
+    # instead of building a boolean DataFrame
+    numeric = df.select_dtypes(include='number')
+    other = df.select_dtypes(exclude='number')
+    if np.isnan(numeric.to_numpy(dtype=np.float64)).any() or other.isna().to_numpy().any():
         raise ValueError("Input data contains missing values")
     
+    # Relative humidity is logged in whole percent within the validated
+    # range, so it is stored in one byte instead of eight
+    humidity = df['humidity'].to_numpy()
+    if np.array_equal(humidity, np.round(humidity)):
+        df['humidity'] = humidity.astype(np.uint8)
+    
     logger.info(f"Loaded {len(df)} records")
     return df
 
 
+def _feature_matrix(values: np.ndarray, months: np.ndarray,
+                    days_of_year: np.ndarray) -> np.ndarray:
+    """
+    Compute all engineered features for the target columns as one matrix.
+    
+    Works on plain arrays in the fixed TARGETS order, without any column
+    lookups, so make_features only has to wrap the result.
+    
+    Args:
+        values: 2D float64 array of the targets (rows x TARGETS)
+        months: Month of each row
+        days_of_year: Day of the year of each row
+        
+    Returns:
+        float32 array of shape (rows, len(FEATURE_COLUMNS)) in FEATURE_COLUMNS order
+    """
+    n_rows = len(values)
+    n_rolling = len(TARGETS) * len(ROLLING_STATS)
+    out = np.empty((n_rows, len(FEATURE_COLUMNS)), dtype=np.float32)
+    
+    # Seasonal features using sine/cosine, computed in float32 (models are
+    # trained on float32 anyway)
+    month_angle = 2 * np.pi * months.astype(np.float32) / 12
+    day_angle = 2 * np.pi * days_of_year.astype(np.float32) / 365
+    out[:, 0] = np.sin(month_angle)
+    out[:, 1] = np.cos(month_angle)
+    out[:, 2] = np.sin(day_angle)
+    out[:, 3] = np.cos(day_angle)
+    
+    # Rolling statistics for different windows; the compiled kernel makes
+    # one pass over all targets, the NumPy version reduces window views
+    rolling_stats = _rolling_stats if _rolling_stats is not None else _rolling_stats_numpy
+    out[:, 4:4 + n_rolling] = rolling_stats(values, ROLLING_WINDOW)
+    
+    # Lag features (previous day values)
+    out[:1, 4 + n_rolling:] = np.nan
+    out[1:, 4 + n_rolling:] = values[:-1]
+    
+    return out
+
+
 def make_features(df: pd.DataFrame) -> pd.DataFrame:
     """
     Create time-based and climate features from the input data.
@@ -98,40 +313,74 @@ def make_features(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with additional features
     """
-    # Create a copy to avoid modifying the original
-    features = df.copy()
-    
-    # Time-based features
-    features['month'] = features.index.month
-    features['day_of_year'] = features.index.dayofyear
-    features['day_of_week'] = features.index.dayofweek
-    
-    # Seasonal features using sine/cosine
-    features['sin_month'] = np.sin(2 * np.pi * features['month'] / 12)
-    features['cos_month'] = np.cos(2 * np.pi * features['month'] / 12)
-    features['sin_day'] = np.sin(2 * np.pi * features['day_of_year'] / 365)
-    features['cos_day'] = np.cos(2 * np.pi * features['day_of_year'] / 365)
-    
-    # Rolling means for different windows
-    for col in TARGETS:
-        # 7-day rolling mean
-        features[f'{col}_rolling_mean_7d'] = features[col].rolling(window=7, min_periods=1).mean()
-        # 7-day rolling std
-        features[f'{col}_rolling_std_7d'] = features[col].rolling(window=7, min_periods=1).std()
-        # 7-day rolling min/max
-        features[f'{col}_rolling_min_7d'] = features[col].rolling(window=7, min_periods=1).min()
-        features[f'{col}_rolling_max_7d'] = features[col].rolling(window=7, min_periods=1).max()
-    
-    # Lag features (previous day values)
-    for col in TARGETS:
-        features[f'{col}_lag_1'] = features[col].shift(1)
+    values = np.ascontiguousarray(df[TARGETS].to_numpy(dtype=np.float64))
+    matrix = _feature_matrix(values, df.index.month.to_numpy(), df.index.dayofyear.to_numpy())
     
-    # Drop the original timestamp-based columns as they're now in the index
-    features = features.drop(['month', 'day_of_year', 'day_of_week'], axis=1)
+    # Input columns are shared with df rather than copied, and the frame is
+    # built once from them and the feature matrix
+    columns = {col: df[col].to_numpy() for col in df.columns}
+    columns.update(zip(FEATURE_COLUMNS, matrix.T))
+    features = pd.DataFrame(columns, index=df.index, copy=False)
     
     # Drop rows with NaN values (from lag features)
     features = features.dropna()
     
+    # The models bin float32 input, so store features in float32 once;
+    # targets keep full precision for fitting and evaluation
+    return features.astype({col: np.float32 for col in features.columns if col not in TARGETS})
+
+
+def _feature_cache_path(path_to_csv: str) -> Path:
+    """
+    Build the features cache file name for a CSV file.
+    
+    Args:
+        path_to_csv: Path to the CSV file with weather history
+        
+    Returns:
+        Cache path that changes whenever the CSV or the feature code changes;
+        same-named CSVs in different directories get different paths
+    """
+    stat = Path(path_to_csv).stat()
+    path_digest = hashlib.blake2b(str(Path(path_to_csv).resolve()).encode(),
+                                  digest_size=8).hexdigest()
+    key = f"{path_digest}_{stat.st_mtime_ns}_{stat.st_size}_v{FEATURE_VERSION}"
+    return FEATURE_CACHE_DIR / f'features_{Path(path_to_csv).stem}_{key}.pkl'
+
+
+def load_features(path_to_csv: str, use_cache: bool = True,
+                  data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Load the weather history and build features, reusing a cached result.
+    
+    Args:
+        path_to_csv: Path to the CSV file with weather history
+        use_cache: Whether to read and write the features cache
+        data: The CSV already parsed by load_data, so a cache miss does not
+            parse it again
+        
+    Returns:
+        DataFrame with features, as returned by make_features
+    """
+    cache_path = _feature_cache_path(path_to_csv)
+    if use_cache and cache_path.exists():
+        logger.info(f"Loading cached features from {cache_path}")
+        return pd.read_pickle(cache_path)
+    
+    features = make_features(load_data(path_to_csv) if data is None else data)
+    
+    if use_cache:
+        FEATURE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Drop caches built for older versions of the same CSV file. The name
+        # up to the path digest identifies the file, and matching the rest
+        # exactly keeps caches of CSVs whose stem extends this one
+        prefix = cache_path.name.rsplit('_', 3)[0]
+        stale_name = re.compile(rf'{re.escape(prefix)}_\d+_\d+_v\d+\.pkl')
+        for stale_path in FEATURE_CACHE_DIR.glob(f'{prefix}_*.pkl'):
+            if stale_name.fullmatch(stale_path.name):
+                stale_path.unlink()
+        features.to_pickle(cache_path)
+    
     return features
 
 
@@ -153,6 +402,41 @@ def evaluate_model(y_true: np.ndarray, y_pred: np.ndarray) -> Dict[str, float]:
     }
 
 
+def _fit_model(model: HistGradientBoostingRegressor, X: np.ndarray,
+               y: np.ndarray) -> HistGradientBoostingRegressor:
+    """
+    Fit a single model; module-level so joblib workers can pickle it.
+    
+    Args:
+        model: Unfitted model
+        X: Training features
+        y: Training target
+        
+    Returns:
+        The fitted model
+    """
+    return model.fit(X, y)
+
+
+def _models_path(path_to_csv: Optional[str] = None) -> Path:
+    """
+    Build the trained models file name, keyed by the CSV they are trained on.
+    
+    Args:
+        path_to_csv: Path to the CSV file with weather history, or None for
+            the unkeyed models file
+        
+    Returns:
+        Models path that changes whenever the CSV changes
+    """
+    if path_to_csv is None:
+        return MODELS_DIR / MODELS_FILE
+    stat = Path(path_to_csv).stat()
+    key = f"{Path(path_to_csv).resolve()}:{stat.st_mtime_ns}:{stat.st_size}"
+    digest = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+    return MODELS_DIR / f'models_{Path(path_to_csv).stem}_{digest}.joblib'
+
+
 def train_model(path_to_csv: str, save_model: bool = True) -> Tuple[Dict, Dict]:
     """
     Train the weather forecasting model.
@@ -164,65 +448,98 @@ def train_model(path_to_csv: str, save_model: bool = True) -> Tuple[Dict, Dict]:
     Returns:
         Tuple of (models dictionary, evaluation metrics)
     """
-    logger.info("Starting model training")
+    return fit_models(load_features(path_to_csv), save_model, _models_path(path_to_csv))
+
+
+def fit_models(features: pd.DataFrame, save_model: bool = True,
+               models_path: Optional[Path] = None) -> Tuple[Dict, Dict]:
+    """
+    Train the weather forecasting model on already built features.
     
-    # Load and preprocess data
-    df = load_data(path_to_csv)
-    features = make_features(df)
+    Args:
+        features: DataFrame with features, as returned by make_features
+        save_model: Whether to save the trained model
+        models_path: Where to save the models, the unkeyed models file by default
+        
+    Returns:
+        Tuple of (models dictionary, evaluation metrics)
+    """
+    logger.info("Starting model training")
     
     # Split data into train and test sets
     train_size = int(len(features) * 0.8)
     train_data = features.iloc[:train_size]
     test_data = features.iloc[train_size:]
     
-    # Prepare target variables
-    X_train = train_data.drop(TARGETS, axis=1)
-    X_test = test_data.drop(TARGETS, axis=1)
+    # Prepare target variables. The histogram models bin float32 input, and
+    # fitting on plain arrays lets predict_days pass float32 rows directly.
+    # DataFrame.to_numpy returns column-major data, so convert it to the
+    # row-major layout the models use once, not on every fit
+    X_train = np.ascontiguousarray(train_data.drop(TARGETS, axis=1).to_numpy(dtype=np.float32))
+    X_test = np.ascontiguousarray(test_data.drop(TARGETS, axis=1).to_numpy(dtype=np.float32))
+    # Targets stay float64, the dtype the models fit gradients in
+    y_train = {target: train_data[target].to_numpy(dtype=np.float64) for target in TARGETS}
     
     models = {}
     metrics = {}
+    params = dict(MODEL_PARAMS, early_stopping=len(X_train) >= MIN_EARLY_STOPPING_SAMPLES)
     
     for target in TARGETS:
-        logger.info(f"Training model for {target}")
-        y_train = train_data[target]
-        y_test = test_data[target]
-        
         # Train models for different quantiles
         models[target] = {
-            'lower': GradientBoostingRegressor(
+            'lower': HistGradientBoostingRegressor(
                 loss='quantile',
-                alpha=0.1,
-                **MODEL_PARAMS
+                quantile=0.1,
+                **params
             ),
-            'pred': GradientBoostingRegressor(
+            'pred': HistGradientBoostingRegressor(
                 loss='squared_error',
-                **MODEL_PARAMS
+                **params
             ),
-            'upper': GradientBoostingRegressor(
+            'upper': HistGradientBoostingRegressor(
                 loss='quantile',
-                alpha=0.9,
-                **MODEL_PARAMS
+                quantile=0.9,
+                **params
             )
         }
-        
-        # Train each model
-        for model_type, model in models[target].items():
-            model.fit(X_train, y_train)
-        
+    
+    # The 9 fits share nothing, so train them in parallel worker processes.
+    # loky caps the OpenMP threads of each worker, so the histogram fits
+    # inside the workers do not oversubscribe the cores. All fits bin the
+    # same X_train; scikit-learn has no public way to share the binned
+    # matrix, and binning is cheap next to growing the trees
+    logger.info(f"Training models for {', '.join(TARGETS)}")
+    jobs = [(target, model_type, model)
+            for target in TARGETS for model_type, model in models[target].items()]
+    fitted = joblib.Parallel(n_jobs=-1, backend='loky')(
+        joblib.delayed(_fit_model)(model, X_train, y_train[target])
+        for target, model_type, model in jobs
+    )
+    for (target, model_type, _), model in zip(jobs, fitted):
+        models[target][model_type] = model
+    
+    for target in TARGETS:
         # Evaluate model
         y_pred = models[target]['pred'].predict(X_test)
-        metrics[target] = evaluate_model(y_test, y_pred)
+        metrics[target] = evaluate_model(test_data[target], y_pred)
         logger.info(f"Metrics for {target}: {metrics[target]}")
     
     # Save models if requested
     if save_model:
-        model_dir = Path('models')
+        models_path = models_path or _models_path()
+        model_dir = models_path.parent
         model_dir.mkdir(exist_ok=True)
         
-        for target in TARGETS:
-            for model_type, model in models[target].items():
-                model_path = model_dir / f'{target}_{model_type}.joblib'
-                joblib.dump(model, model_path)
+        # Drop models trained on older versions of the same CSV. Only
+        # '<stem>_<digest>.joblib' names match, so models of CSVs whose stem
+        # extends this one are kept
+        if models_path.name != MODELS_FILE:
+            stem = models_path.name.rsplit('_', 1)[0]
+            stale_name = re.compile(rf'{re.escape(stem)}_[0-9a-f]{{16}}\.joblib')
+            for stale_path in model_dir.glob(f'{stem}_*.joblib'):
+                if stale_name.fullmatch(stale_path.name):
+                    stale_path.unlink()
+        joblib.dump(models, models_path)
         
         # Save metrics
         with open(model_dir / 'metrics.json', 'w') as f:
@@ -233,17 +550,29 @@ def train_model(path_to_csv: str, save_model: bool = True) -> Tuple[Dict, Dict]:
     return models, metrics
 
 
-def load_trained_models() -> Optional[Dict]:
+def load_trained_models(path_to_csv: Optional[str] = None) -> Optional[Dict]:
     """
     Load trained models from disk.
     
+    Args:
+        path_to_csv: Path to the CSV file the models must be trained on; when
+            given, models trained on other data or an older copy are ignored
+        
     Returns:
         Dictionary of trained models or None if models don't exist
     """
-    model_dir = Path('models')
+    model_dir = MODELS_DIR
     if not model_dir.exists():
         return None
     
+    # Tree arrays are mapped read-only from disk instead of copied to memory
+    models_path = _models_path(path_to_csv)
+    if models_path.exists():
+        return joblib.load(models_path, mmap_mode='r')
+    if path_to_csv is not None:
+        return None
+    
+    # Fall back to the older layout with one file per model
     models = {}
     for target in TARGETS:
         models[target] = {}
@@ -272,32 +601,40 @@ def predict_days(model: Dict, latest_rows_df: pd.DataFrame,
     """
     logger.info(f"Making predictions for {days_ahead} days ahead")
     
-    # Create features for prediction
-    features = make_features(latest_rows_df)
-    
-    # Get the last row for initial prediction
-    current_features = features.iloc[[-1]].copy()
-    
-    predictions = []
+    # Create features for prediction. Only the last row is used, and its
+    # rolling window and lag need just the last ROLLING_WINDOW + 1 records
+    history = latest_rows_df.iloc[-(ROLLING_WINDOW + 1):]
+    features = make_features(history).drop(TARGETS, axis=1)
+    
+    # Feature rows of all forecast days as one C-ordered float32 array, the
+    # dtype and layout the models were fit on, so predict does not convert
+    # them. Day 0 starts from the last history row
+    day_features = np.empty((days_ahead, features.shape[1]), dtype=np.float32)
+    current_features = features.iloc[-1].to_numpy(dtype=np.float32, copy=True)
+    lag_columns = {target: features.columns.get_loc(f'{target}_lag_1') for target in TARGETS}
+    
+    # Forecast columns, keyed as in the output
+    predictions = {f'{target}_{suffix}': np.empty(days_ahead)
+                   for target in TARGETS for suffix in ['pred', 'low', 'high']}
+    last_date = latest_rows_df.index[-1]
+    predictions['target_date'] = [last_date + timedelta(days=day + 1) for day in range(days_ahead)]
+    
+    # Only the point forecasts feed the next day's lags, so they are
+    # predicted day by day
     for day in range(days_ahead):
-        # Make predictions for current day
-        day_predictions = {}
+        day_features[day] = current_features
+        row = day_features[day:day + 1]
         for target in TARGETS:
-            # Drop target columns before prediction
-            pred_features = current_features.drop(TARGETS, axis=1)
-            day_predictions[f'{target}_pred'] = model[target]['pred'].predict(pred_features)[0]
-            day_predictions[f'{target}_low'] = model[target]['lower'].predict(pred_features)[0]
-            day_predictions[f'{target}_high'] = model[target]['upper'].predict(pred_features)[0]
-        
-        # Add target date
-        target_date = latest_rows_df.index[-1] + timedelta(days=day + 1)
-        day_predictions['target_date'] = target_date
-        
-        predictions.append(day_predictions)
-        
-        # Update features for next day prediction
+            value = model[target]['pred'].predict(row)[0]
+            predictions[f'{target}_pred'][day] = value
+            current_features[lag_columns[target]] = value
+    
+    # The interval bounds depend on nothing but the feature rows, so each
+    # quantile model predicts all days in one call instead of one per day
+    if days_ahead > 0:
         for target in TARGETS:
-            current_features[f'{target}_lag_1'] = day_predictions[f'{target}_pred']
+            predictions[f'{target}_low'] = model[target]['lower'].predict(day_features)
+            predictions[f'{target}_high'] = model[target]['upper'].predict(day_features)
     
     return pd.DataFrame(predictions)
 
@@ -311,19 +648,20 @@ def main():
     args = parser.parse_args()
     
     try:
+        # Parse the CSV once, for both training and prediction
+        latest_data = load_data(args.data)
+        
         # Try to load existing models
-        models = None if args.retrain else load_trained_models()
+        models = None if args.retrain else load_trained_models(args.data)
         
         # Train new models if needed
         if models is None:
             logger.info("Training new models")
-            models, metrics = train_model(args.data)
+            models, metrics = fit_models(load_features(args.data, data=latest_data),
+                                         models_path=_models_path(args.data))
         else:
             logger.info("Using existing trained models")
         
-        # Load latest data for prediction
-        latest_data = load_data(args.data)
-        
         # Make predictions
         forecast = predict_days(models, latest_data, args.days, args.alpha)
         
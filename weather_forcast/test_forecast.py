@@ -1,14 +1,25 @@
+import shutil
+import tempfile
 import unittest
+from pathlib import Path
+from unittest import mock
 import pandas as pd
 import numpy as np
 from datetime import datetime
+import forecast
 from forecast import (
     validate_data,
     make_features,
     evaluate_model,
+    load_features,
+    load_data,
+    fit_models,
+    predict_days,
     TARGETS
 )
 
+DATA_PATH = Path(__file__).with_name('weather_3months_daily.csv')
+
 class TestForecast(unittest.TestCase):
     def setUp(self):
         # Create sample data for testing
@@ -78,5 +89,53 @@ class TestForecast(unittest.TestCase):
         self.assertGreaterEqual(metrics['mae'], 0)  # MAE should be non-negative
         self.assertGreaterEqual(metrics['rmse'], 0)  # RMSE should be non-negative
 
+    def test_feature_cache_same_named_csvs(self):
+        """Test that same-named CSVs in different directories keep separate caches"""
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            first, second = tmp / 'a' / 'weather.csv', tmp / 'b' / 'weather.csv'
+            for csv_path, rows in [(first, None), (second, 40)]:
+                csv_path.parent.mkdir()
+                with open(DATA_PATH) as src, open(csv_path, 'w') as dst:
+                    dst.writelines(src.readlines()[:rows])
+            # Another CSV whose name starts with the same stem
+            shutil.copy(DATA_PATH, tmp / 'a' / 'weather_2.csv')
+            
+            with mock.patch.object(forecast, 'FEATURE_CACHE_DIR', tmp / 'cache'):
+                load_features(str(tmp / 'a' / 'weather_2.csv'))
+                first_features = load_features(str(first))
+                second_features = load_features(str(second))
+                
+                self.assertEqual(len(list((tmp / 'cache').glob('*.pkl'))), 3)
+                pd.testing.assert_frame_equal(load_features(str(first)), first_features)
+                pd.testing.assert_frame_equal(load_features(str(second)), second_features)
+                self.assertNotEqual(len(first_features), len(second_features))
+
+    def test_fit_models_keeps_other_csv_models(self):
+        """Test that saving models drops only older models of the same CSV"""
+        features = make_features(load_data(str(DATA_PATH)))
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            stale = tmp / 'models_weather_0123456789abcdef.joblib'
+            other = tmp / 'models_weather_2_0123456789abcdef.joblib'
+            stale.touch()
+            other.touch()
+            
+            models_path = tmp / 'models_weather_fedcba9876543210.joblib'
+            fit_models(features, models_path=models_path)
+            
+            self.assertTrue(models_path.exists())
+            self.assertFalse(stale.exists())
+            self.assertTrue(other.exists())
+
+    def test_multi_day_forecast_changes(self):
+        """Test that a multi-day forecast does not repeat the same day"""
+        data = load_data(str(DATA_PATH))
+        models, _ = fit_models(make_features(data), save_model=False)
+        
+        forecast_df = predict_days(models, data, days_ahead=5).drop(columns='target_date')
+        
+        self.assertGreater(len(forecast_df.drop_duplicates()), 1)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file